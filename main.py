@@ -8,26 +8,7 @@ import os
 # Add netscope package to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from netscope.ui.main_window import MainWindow
-
-
-def main():
-    """Main application entry point."""
-    # Enable High DPI scaling
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-    
-    app = QApplication(sys.argv)
-    app.setApplicationName("NetScope")
-    app.setApplicationVersion("1.0.0")
-    
-    # Create and show main window
-    window = MainWindow()
-    window.show()
-    
-    sys.exit(app.exec_())
+from netscope.main import main
 
 
 if __name__ == "__main__":
@@ -2,265 +2,809 @@
 Data Manager - Handles SQLite database operations for storing historical monitoring data.
 """
 import sqlite3
+import atexit
+import contextlib
+import functools
 import json
+import math
 import os
 import sys
-from datetime import datetime, timedelta
+from pathlib import Path
+from time import time as _now
 from typing import List, Dict, Optional, Tuple
 import threading
+import queue
 
+import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_json_dumps(obj: Dict) -> bytes:
+    """Encode an export row the way orjson.dumps does: compact UTF-8, NaN/inf as null."""
+    # json would otherwise write bare NaN/Infinity, which is not valid JSON
+    return json.dumps(
+        {key: None if isinstance(value, float) and not math.isfinite(value) else value
+         for key, value in obj.items()},
+        separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8')
+
+
+# JSON export encoder, chosen once at import
+_json_dumps = orjson.dumps if orjson is not None else _stdlib_json_dumps
+
+
+# Column name and dtype of each field returned by the history readers
+_NETWORK_HISTORY_COLUMNS = (
+    ('timestamp', np.float64),
+    ('adapter_name', object),
+    ('upload_speed', np.float64),
+    ('download_speed', np.float64),
+    ('ping_latency', np.float64),
+    ('bytes_sent', np.float64),
+    ('bytes_received', np.float64),
+)
+
+_SYSTEM_HISTORY_COLUMNS = (
+    ('timestamp', np.float64),
+    ('cpu_usage', np.float64),
+    ('ram_usage', np.float64),
+    ('disk_usage', np.float64),
+    ('uptime', np.float64),
+)
+
+
+# Queue markers understood by the writer thread
+_FLUSH = '__flush__'
+_STOP = '__stop__'
+
+# Longest a flush() or close() waits on the writer thread before giving up
+_FLUSH_TIMEOUT = 30.0
+
+# History readers may run on the UI thread, so they wait at most this long
+# for queued rows and otherwise read what is already committed
+_READ_FLUSH_TIMEOUT = 0.5
+
+# SQL text is kept in single-line module constants so every call passes the
+# exact same string and hits sqlite3's prepared-statement cache.
+_INSERT_SQL = {
+    'network_stats': (
+        "INSERT INTO network_stats (timestamp, adapter_name, upload_speed, download_speed, "
+        "ping_latency, bytes_sent, bytes_received, public_ip, isp_name, location) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    ),
+    'system_stats': (
+        "INSERT INTO system_stats (timestamp, cpu_usage, ram_usage, disk_usage, uptime) "
+        "VALUES (?, ?, ?, ?, ?)"
+    ),
+    'speed_tests': (
+        "INSERT INTO speed_tests (timestamp, download_mbps, upload_mbps, ping_ms, server_name) "
+        "VALUES (?, ?, ?, ?, ?)"
+    ),
+    'events': "INSERT INTO events (timestamp, event_type, message) VALUES (?, ?, ?)",
+}
+
+# Rows per multi-row INSERT when flushing a batch; leftovers go through
+# executemany so each table only ever prepares two INSERT statements.
+_INSERT_CHUNK_ROWS = 50
+
+# Raw sample tables, created in this order. Plain INTEGER PRIMARY KEY ids
+# (no AUTOINCREMENT) so inserts skip the sqlite_sequence update.
+_CREATE_TABLE_SQL = {
+    # Network stats table
+    'network_stats': '''
+        CREATE TABLE IF NOT EXISTS network_stats (
+            id INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            adapter_name TEXT,
+            upload_speed REAL,
+            download_speed REAL,
+            ping_latency REAL,
+            bytes_sent REAL,
+            bytes_received REAL,
+            public_ip TEXT,
+            isp_name TEXT,
+            location TEXT
+        )
+    ''',
+    # System stats table
+    'system_stats': '''
+        CREATE TABLE IF NOT EXISTS system_stats (
+            id INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            cpu_usage REAL,
+            ram_usage REAL,
+            disk_usage REAL,
+            uptime REAL
+        )
+    ''',
+    # Speed test results table
+    'speed_tests': '''
+        CREATE TABLE IF NOT EXISTS speed_tests (
+            id INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            download_mbps REAL,
+            upload_mbps REAL,
+            ping_ms REAL,
+            server_name TEXT
+        )
+    ''',
+    # Events log table
+    'events': '''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY,
+            timestamp REAL NOT NULL,
+            event_type TEXT,
+            message TEXT
+        )
+    ''',
+}
+
+# Columns written by the exporters, in file order
+_EXPORT_COLUMNS = {
+    'network_stats': (
+        'id', 'timestamp', 'adapter_name', 'upload_speed', 'download_speed',
+        'ping_latency', 'bytes_sent', 'bytes_received', 'public_ip', 'isp_name', 'location'
+    ),
+    'system_stats': ('id', 'timestamp', 'cpu_usage', 'ram_usage', 'disk_usage', 'uptime'),
+    'speed_tests': ('id', 'timestamp', 'download_mbps', 'upload_mbps', 'ping_ms', 'server_name'),
+    'events': ('id', 'timestamp', 'event_type', 'message'),
+}
+
+# Numeric samples are stored as fixed-point integers (value * scale). SQLite
+# writes integral values in a few bytes even in REAL columns, so rows stay
+# compact; every reader divides the scale back out in SQL.
+_TIMESTAMP_SCALE = 1000     # milliseconds
+_SPEED_SCALE = 1000         # kbps
+_PING_SCALE = 100           # hundredths of a ms
+_PERCENT_SCALE = 100        # basis points
+
+_STORAGE_SCALES = {
+    'timestamp': _TIMESTAMP_SCALE,
+    'upload_speed': _SPEED_SCALE,
+    'download_speed': _SPEED_SCALE,
+    'ping_latency': _PING_SCALE,
+    'bytes_sent': 1,
+    'bytes_received': 1,
+    'cpu_usage': _PERCENT_SCALE,
+    'ram_usage': _PERCENT_SCALE,
+    'disk_usage': _PERCENT_SCALE,
+    'uptime': 1,
+}
+
+# Rollup tables of system_stats and their bucket size in seconds, coarsest
+# first. Each bucket row holds the running average of its samples (the
+# latest sample for uptime), keyed by the bucket start time.
+_SYSTEM_ROLLUPS = (
+    ('system_stats_1h', 3600),
+    ('system_stats_1m', 60),
+)
+
+# Averaged rollup metrics. Each keeps its own sample count (<metric>_n) so a
+# NULL sample is skipped instead of turning the bucket's average NULL.
+_ROLLUP_METRICS = ('cpu_usage', 'ram_usage', 'disk_usage')
+
+# Parameters: bucket timestamp, cpu_usage, ram_usage, disk_usage, uptime
+_ROLLUP_UPSERT_SQL = {
+    table: (
+        f"INSERT INTO {table} (timestamp, n, cpu_usage_n, ram_usage_n, disk_usage_n, "
+        "cpu_usage, ram_usage, disk_usage, uptime) "
+        "VALUES (?1, 1, ?2 IS NOT NULL, ?3 IS NOT NULL, ?4 IS NOT NULL, ?2, ?3, ?4, ?5) "
+        "ON CONFLICT(timestamp) DO UPDATE SET "
+        + ''.join(
+            f"{metric} = CASE WHEN excluded.{metric} IS NULL THEN {metric} "
+            f"ELSE (COALESCE({metric}, 0) * {metric}_n + excluded.{metric}) / ({metric}_n + 1) END, "
+            f"{metric}_n = {metric}_n + excluded.{metric}_n, "
+            for metric in _ROLLUP_METRICS
+        )
+        + "uptime = COALESCE(excluded.uptime, uptime), n = n + 1"
+    )
+    for table, _ in _SYSTEM_ROLLUPS
+}
+
+# Bumped whenever _migrate_schema gains a step
+_SCHEMA_VERSION = 5
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# Every statement is a module-level constant, so a larger sqlite3 statement
+# cache keeps all of them prepared across calls.
+_STATEMENT_CACHE_SIZE = 256
+
+
+def _to_fixed(value: Optional[float], scale: int) -> Optional[int]:
+    """Convert a sample to its fixed-point storage value (None if missing or not finite)."""
+    # NaN/inf from a bad sensor read would make int() raise on the caller's thread
+    if value is None or not math.isfinite(value):
+        return None
+    return int(round(value * scale))
+
+
+def _select_list(columns) -> str:
+    """Build a SELECT column list that converts fixed-point columns back to floats."""
+    return ', '.join(
+        f'{name} / {_STORAGE_SCALES[name]}.0 AS {name}' if _STORAGE_SCALES.get(name, 1) != 1
+        else name
+        for name in columns
+    )
+
+
+# Range filters and ordering use the qualified column so they hit the
+# timestamp index rather than the converted alias.
+_NETWORK_HISTORY_SQL = (
+    "SELECT " + _select_list(name for name, _ in _NETWORK_HISTORY_COLUMNS) +
+    " FROM network_stats WHERE network_stats.timestamp >= ?"
+    " ORDER BY network_stats.timestamp ASC"
+)
+_NETWORK_ADAPTER_HISTORY_SQL = (
+    "SELECT " + _select_list(name for name, _ in _NETWORK_HISTORY_COLUMNS) +
+    " FROM network_stats INDEXED BY idx_network_adapter_ts"
+    " WHERE network_stats.adapter_name = ? AND network_stats.timestamp >= ?"
+    " ORDER BY network_stats.timestamp ASC"
+)
+_SYSTEM_HISTORY_SQL = {
+    table: (
+        "SELECT " + _select_list(name for name, _ in _SYSTEM_HISTORY_COLUMNS) +
+        f" FROM {table} WHERE {table}.timestamp >= ?"
+        f" ORDER BY {table}.timestamp ASC"
+    )
+    for table in ('system_stats',) + tuple(table for table, _ in _SYSTEM_ROLLUPS)
+}
+_RECENT_EVENTS_SQL = (
+    "SELECT " + _select_list(('timestamp', 'event_type', 'message')) +
+    " FROM events ORDER BY events.timestamp DESC LIMIT ?"
+)
+
+# Export statements per table; the keys double as the whitelist of tables
+# that may be exported.
+_EXPORT_SQL = {
+    table: f"SELECT {_select_list(columns)} FROM {table}"
+    for table, columns in _EXPORT_COLUMNS.items()
+}
+_EXPORT_SINCE_SQL = {
+    table: f"{sql} WHERE {table}.timestamp >= ?"
+    for table, sql in _EXPORT_SQL.items()
+}
+
+
+def _rows_to_columns(rows: List[tuple], columns: Tuple) -> Dict[str, np.ndarray]:
+    """Transpose result rows into one NumPy array per column (NULL becomes NaN)."""
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    return {
+        name: np.array(column, dtype=dtype)
+        for (name, dtype), column in zip(columns, values)
+    }
+
+
+# Directory of this module (netscope/core), resolved once at import
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# Serializes schema setup between DataManager instances in this process
+_SCHEMA_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
 def get_base_path():
     """Get base path for data storage (works for both development and PyInstaller)."""
     if getattr(sys, 'frozen', False):
         # Running as compiled executable
         base_path = os.path.dirname(sys.executable)
     else:
-        # Running as script
-        base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        # Running as script: two levels above netscope/core
+        base_path = os.path.dirname(os.path.dirname(_MODULE_DIR))
     return base_path
 
 
 class DataManager:
     """Manages SQLite database for storing network and system monitoring data."""
     
-    def __init__(self, db_path: str = None):
-        """Initialize data manager with database path."""
+    def __init__(self, db_path: str = None, retention_days: float = 30,
+                 flush_every: int = 200):
+        """Initialize data manager with database path, retention window and batch size."""
         if db_path is None:
             base_path = get_base_path()
             db_path = os.path.join(base_path, "data", "network_logs.db")
         self.db_path = db_path
         self.lock = threading.Lock()
-        self._ensure_database()
+        self._ensure_database_dir()
+        # One long-lived connection shared by all callers and serialized by
+        # self.lock; opening a connection per call dwarfed the insert itself.
+        self.conn = self._connect()
+        # A file already at the current schema skips the DDL round-trips. The
+        # version is read from the file itself, so a database deleted or
+        # replaced while the process runs is set up again.
+        with _SCHEMA_LOCK:
+            if self.conn.execute('PRAGMA user_version').fetchone()[0] != _SCHEMA_VERSION:
+                self._ensure_database()
+        
+        # Multi-row INSERT per table, sized to stay under the bound
+        # parameter limit of this SQLite build
+        max_params = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        self._chunk_insert: Dict[str, Tuple[int, str]] = {}
+        for table, sql in _INSERT_SQL.items():
+            head, values = sql.split(' VALUES ')
+            rows = max(1, min(_INSERT_CHUNK_ROWS, max_params // values.count('?')))
+            self._chunk_insert[table] = (rows, f"{head} VALUES {', '.join([values] * rows)}")
+        
+        # Read-only connections, one per reader thread
+        self._readers = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        
+        # Writes are queued and committed by a dedicated thread in batches of
+        # up to _flush_every rows or every _flush_interval seconds, so callers
+        # never wait on disk.
+        self._flush_every = flush_every
+        self._flush_interval = 5.0
+        self._last_flush = _now()
+        
+        # Rows older than retention_days are pruned by the writer thread on
+        # startup and then every _retention_interval seconds, which keeps the
+        # tables and their indexes bounded to the hot window.
+        self.retention_days = retention_days
+        self._retention_interval = 3600.0
+        self._last_retention = 0.0
+        
+        # Long-lived readers can stall the automatic checkpoint, so the writer
+        # also truncates the WAL itself every _checkpoint_interval seconds.
+        self._checkpoint_interval = 60.0
+        self._last_checkpoint = _now()
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="netscope-db-writer", daemon=True
+        )
+        self._writer.start()
+        
+        # Queued rows must not be lost if the app exits without close()
+        self._closed = False
+        atexit.register(self.close)
     
-    def _ensure_database(self):
-        """Ensure database file and directory exist, create schema if needed."""
+    def _connect(self) -> sqlite3.Connection:
+        """Open the read-write connection and apply the performance PRAGMAs."""
+        # Autocommit mode: write transactions are opened explicitly by
+        # _transaction() with BEGIN IMMEDIATE instead of sqlite3's implicit
+        # deferred BEGIN, which can hit SQLITE_BUSY upgrading to a write lock.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               isolation_level=None,
+                               cached_statements=_STATEMENT_CACHE_SIZE)
+        
+        # Only takes effect on a brand-new database, so it must run before
+        # anything (including the WAL switch) writes the file header.
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        
+        # WAL turns each commit into a single append and lets readers run
+        # alongside the writer; it is meaningless for in-memory databases.
+        if self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA wal_autocheckpoint=1000')
+        self._apply_common_pragmas(conn)
+        return conn
+    
+    def _connect_readonly(self) -> sqlite3.Connection:
+        """Open a read-only connection for history queries and exports."""
+        uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=_STATEMENT_CACHE_SIZE)
+        # Refuse writes at the SQL level as well as at the file level
+        conn.execute('PRAGMA query_only=1')
+        self._apply_common_pragmas(conn)
+        return conn
+    
+    def _apply_common_pragmas(self, conn: sqlite3.Connection):
+        """Apply the PRAGMAs shared by read-write and read-only connections."""
+        # Let SQLite wait out a competing lock instead of failing immediately
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-131072')
+        # Memory-mapped reads for the history scans and exports; writes
+        # still go through the pager.
+        conn.execute('PRAGMA mmap_size=536870912')
+    
+    @contextlib.contextmanager
+    def _reader(self):
+        """Yield a connection for read-only queries on the calling thread."""
+        if self.db_path == ':memory:':
+            # An in-memory database only exists on the writer connection
+            with self.lock:
+                yield self.conn
+            return
+        
+        # With WAL each reader sees a consistent snapshot without blocking
+        # the writer, so readers get their own connection and skip the lock.
+        conn = getattr(self._readers, 'conn', None)
+        if conn is None:
+            conn = self._connect_readonly()
+            self._readers.conn = conn
+            with self.lock:
+                self._reader_conns.append(conn)
+        yield conn
+    
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Hold the write lock and run the block in a BEGIN IMMEDIATE transaction."""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+    
+    def _ensure_database_dir(self):
+        """Ensure the directory holding the database file exists."""
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
-        
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
+    
+    def _ensure_database(self):
+        """Create schema if needed."""
+        self._backup_before_migration()
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
-            # Network stats table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS network_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    adapter_name TEXT,
-                    upload_speed REAL,
-                    download_speed REAL,
-                    ping_latency REAL,
-                    bytes_sent REAL,
-                    bytes_received REAL,
-                    public_ip TEXT,
-                    isp_name TEXT,
-                    location TEXT
-                )
-            ''')
-            
-            # System stats table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    cpu_usage REAL,
-                    ram_usage REAL,
-                    disk_usage REAL,
-                    uptime REAL
-                )
-            ''')
+            for sql in _CREATE_TABLE_SQL.values():
+                cursor.execute(sql)
             
-            # Speed test results table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS speed_tests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    download_mbps REAL,
-                    upload_mbps REAL,
-                    ping_ms REAL,
-                    server_name TEXT
-                )
-            ''')
+            # Per-minute and per-hour averages of system_stats for long windows
+            for table, _ in _SYSTEM_ROLLUPS:
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        timestamp INTEGER PRIMARY KEY,
+                        n INTEGER NOT NULL,
+                        cpu_usage_n INTEGER NOT NULL DEFAULT 0,
+                        ram_usage_n INTEGER NOT NULL DEFAULT 0,
+                        disk_usage_n INTEGER NOT NULL DEFAULT 0,
+                        cpu_usage REAL,
+                        ram_usage REAL,
+                        disk_usage REAL,
+                        uptime REAL
+                    )
+                ''')
             
-            # Events log table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    event_type TEXT,
-                    message TEXT
-                )
-            ''')
+            vacuum = self._migrate_schema(cursor)
             
-            conn.commit()
-            conn.close()
+            # Timestamp indexes turn the history range queries into index
+            # seeks; created after migrating since table rebuilds drop them.
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_network_ts ON network_stats(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_network_adapter_ts ON network_stats(adapter_name, timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_system_ts ON system_stats(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_speed_tests_ts ON speed_tests(timestamp)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_events_ts ON events(timestamp)')
+        
+        if vacuum:
+            # Rewrites the file once, applying the auto_vacuum mode set in _connect
+            with self.lock:
+                self.conn.execute('VACUUM')
     
-    def log_network_stats(self, stats: Dict):
-        """Log network statistics to database."""
+    def _backup_before_migration(self):
+        """Copy an existing database aside before the v1/v3 migrations rewrite it."""
+        if self.db_path == ':memory:':
+            return
+        
         with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO network_stats 
-                (timestamp, adapter_name, upload_speed, download_speed, ping_latency,
-                 bytes_sent, bytes_received, public_ip, isp_name, location)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().timestamp(),
-                stats.get('adapter_name'),
-                stats.get('upload_speed'),
-                stats.get('download_speed'),
-                stats.get('ping_latency'),
-                stats.get('bytes_sent'),
-                stats.get('bytes_received'),
-                stats.get('public_ip'),
-                stats.get('isp_name'),
-                stats.get('location')
-            ))
+            version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+            existing = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'system_stats'"
+            ).fetchone()
+            if version >= 3 or existing is None:
+                return
             
-            conn.commit()
-            conn.close()
+            # The backup API copies a consistent snapshot, WAL frames
+            # included; any error aborts startup before data is rewritten.
+            backup = sqlite3.connect(f'{self.db_path}.v{version}.bak')
+            try:
+                self.conn.backup(backup)
+            finally:
+                backup.close()
+    
+    def _migrate_schema(self, cursor: sqlite3.Cursor) -> bool:
+        """Bring an existing database up to _SCHEMA_VERSION.
+        
+        Returns True when the caller must VACUUM once the transaction commits.
+        """
+        version = cursor.execute('PRAGMA user_version').fetchone()[0]
+        
+        if version < 1:
+            # Float samples -> fixed-point integers (see _STORAGE_SCALES)
+            for table, columns in _EXPORT_COLUMNS.items():
+                assignments = ', '.join(
+                    f'{name} = CAST(ROUND({name} * {_STORAGE_SCALES[name]}) AS INTEGER)'
+                    for name in columns if name in _STORAGE_SCALES
+                )
+                cursor.execute(f'UPDATE {table} SET {assignments}')
+        
+        if version < 3:
+            # Rebuild tables still declared with AUTOINCREMENT. Renaming
+            # takes the old indexes along; they are recreated afterwards.
+            for table, sql in _CREATE_TABLE_SQL.items():
+                row = cursor.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                ).fetchone()
+                if row and 'AUTOINCREMENT' in row[0].upper():
+                    cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+                    cursor.execute(sql)
+                    cursor.execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+                    cursor.execute(f'DROP TABLE {table}_old')
+        
+        if version < 4:
+            # The rollup tables appeared in v2 and gained per-metric counts in
+            # v4; either way (re)build them from the raw samples, which also
+            # repairs averages a NULL sample had turned NULL.
+            for table, bucket in _SYSTEM_ROLLUPS:
+                existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+                for metric in _ROLLUP_METRICS:
+                    if f'{metric}_n' not in existing:
+                        cursor.execute(
+                            f'ALTER TABLE {table} ADD COLUMN {metric}_n INTEGER NOT NULL DEFAULT 0'
+                        )
+                size = bucket * _TIMESTAMP_SCALE
+                cursor.execute(f'DELETE FROM {table}')
+                cursor.execute(f'''
+                    INSERT INTO {table} (timestamp, n, cpu_usage_n, ram_usage_n, disk_usage_n,
+                                         cpu_usage, ram_usage, disk_usage, uptime)
+                    SELECT CAST(timestamp AS INTEGER) / {size} * {size}, COUNT(*),
+                           COUNT(cpu_usage), COUNT(ram_usage), COUNT(disk_usage),
+                           AVG(cpu_usage), AVG(ram_usage), AVG(disk_usage), MAX(uptime)
+                    FROM system_stats GROUP BY 1
+                ''')
+        
+        vacuum = False
+        if version < 5:
+            # Files created before incremental auto-vacuum keep auto_vacuum=NONE,
+            # leaving incremental_vacuum a no-op, until a VACUUM; that cannot
+            # run inside this transaction.
+            mode = cursor.execute('PRAGMA auto_vacuum').fetchone()[0]
+            vacuum = mode != _AUTO_VACUUM_INCREMENTAL
+        
+        cursor.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+        return vacuum
+    
+    def log_network_stats(self, stats: Dict):
+        """Queue network statistics for the background writer."""
+        self._enqueue('network_stats', (
+            int(_now() * _TIMESTAMP_SCALE),
+            stats.get('adapter_name'),
+            _to_fixed(stats.get('upload_speed'), _SPEED_SCALE),
+            _to_fixed(stats.get('download_speed'), _SPEED_SCALE),
+            _to_fixed(stats.get('ping_latency'), _PING_SCALE),
+            _to_fixed(stats.get('bytes_sent'), 1),
+            _to_fixed(stats.get('bytes_received'), 1),
+            stats.get('public_ip'),
+            stats.get('isp_name'),
+            stats.get('location')
+        ))
     
     def log_system_stats(self, stats: Dict):
-        """Log system statistics to database."""
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO system_stats 
-                (timestamp, cpu_usage, ram_usage, disk_usage, uptime)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().timestamp(),
-                stats.get('cpu_usage'),
-                stats.get('ram_usage'),
-                stats.get('disk_usage'),
-                stats.get('uptime')
-            ))
-            
-            conn.commit()
-            conn.close()
+        """Queue system statistics for the background writer."""
+        self._enqueue('system_stats', (
+            int(_now() * _TIMESTAMP_SCALE),
+            _to_fixed(stats.get('cpu_usage'), _PERCENT_SCALE),
+            _to_fixed(stats.get('ram_usage'), _PERCENT_SCALE),
+            _to_fixed(stats.get('disk_usage'), _PERCENT_SCALE),
+            _to_fixed(stats.get('uptime'), 1)
+        ))
     
     def log_speed_test(self, download_mbps: float, upload_mbps: float, 
                        ping_ms: float, server_name: str = ""):
-        """Log speed test results."""
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO speed_tests 
-                (timestamp, download_mbps, upload_mbps, ping_ms, server_name)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().timestamp(),
-                download_mbps,
-                upload_mbps,
-                ping_ms,
-                server_name
-            ))
-            
-            conn.commit()
-            conn.close()
+        """Queue speed test results for the background writer."""
+        self._enqueue('speed_tests', (
+            int(_now() * _TIMESTAMP_SCALE),
+            download_mbps,
+            upload_mbps,
+            ping_ms,
+            server_name
+        ))
     
     def log_event(self, event_type: str, message: str):
-        """Log system event."""
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        """Queue a system event for the background writer."""
+        self._enqueue('events', (
+            int(_now() * _TIMESTAMP_SCALE),
+            event_type,
+            message
+        ))
+    
+    def _enqueue(self, table: str, row: tuple):
+        """Hand a row to the writer thread, or write it directly if the writer died."""
+        if self._closed:
+            print(f"Database closed, {table} row not saved")
+        elif self._writer.is_alive():
+            self._queue.put((table, row))
+        else:
+            pending: Dict[str, List[tuple]] = {name: [] for name in _INSERT_SQL}
+            pending[table].append(row)
+            self._write_pending(pending)
+    
+    def _writer_loop(self):
+        """Drain the write queue, committing a batch when it is full, old or flushed."""
+        pending: Dict[str, List[tuple]] = {table: [] for table in _INSERT_SQL}
+        pending_count = 0
+        waiters: List[threading.Event] = []
+        stopping = False
+        
+        try:
+            self._apply_retention()
+            
+            while not stopping:
+                # Wake for the next checkpoint or retention pass even when
+                # idle, and for the batch deadline when rows are pending
+                deadline = min(self._last_checkpoint + self._checkpoint_interval,
+                               self._last_retention + self._retention_interval)
+                if pending_count:
+                    deadline = min(deadline, self._last_flush + self._flush_interval)
+                timeout = max(0.0, deadline - _now())
+            
+                items = []
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                    while True:
+                        items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
             
-            cursor.execute('''
-                INSERT INTO events (timestamp, event_type, message)
-                VALUES (?, ?, ?)
-            ''', (
-                datetime.now().timestamp(),
-                event_type,
-                message
-            ))
+                for table, payload in items:
+                    if table == _FLUSH:
+                        waiters.append(payload)
+                    elif table == _STOP:
+                        waiters.append(payload)
+                        stopping = True
+                    else:
+                        pending[table].append(payload)
+                        pending_count += 1
             
-            conn.commit()
-            conn.close()
+                if (waiters or pending_count >= self._flush_every or
+                        _now() - self._last_flush >= self._flush_interval):
+                    self._write_pending(pending)
+                    pending_count = 0
+                    for event in waiters:
+                        event.set()
+                    waiters.clear()
+            
+                if _now() - self._last_retention >= self._retention_interval:
+                    self._apply_retention()
+                if _now() - self._last_checkpoint >= self._checkpoint_interval:
+                    self._checkpoint()
+        finally:
+            # Never leave a flush() or close() caller waiting on a dead writer
+            for event in waiters:
+                event.set()
     
-    def get_network_history(self, seconds: int = 3600) -> List[Dict]:
-        """Get network stats history for the last N seconds."""
-        cutoff_time = datetime.now().timestamp() - seconds
+    def _write_pending(self, pending: Dict[str, List[tuple]]):
+        """Write all pending rows in a single transaction and clear them."""
+        self._last_flush = _now()
+        if not any(pending.values()):
+            return
         
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
+        # The batch is committed as one transaction, or rolled back if any
+        # insert fails so no transaction is left pinning WAL frames.
+        try:
+            with self._transaction() as conn:
+                for table, rows in pending.items():
+                    if rows:
+                        self._insert_rows(conn, table, rows)
+                
+                # Fold the new system samples into the rollup buckets
+                for table, bucket in _SYSTEM_ROLLUPS:
+                    size = bucket * _TIMESTAMP_SCALE
+                    conn.executemany(_ROLLUP_UPSERT_SQL[table], [
+                        (row[0] // size * size,) + row[1:]
+                        for row in pending['system_stats']
+                    ])
+        except sqlite3.Error as e:
+            print(f"Database write error: {e}")
+        
+        for rows in pending.values():
+            rows.clear()
+    
+    def _insert_rows(self, conn: sqlite3.Connection, table: str, rows: List[tuple]):
+        """Insert rows as multi-row VALUES statements, one statement per chunk."""
+        chunk, sql = self._chunk_insert[table]
+        full = len(rows) - len(rows) % chunk
+        for start in range(0, full, chunk):
+            conn.execute(sql, [value for row in rows[start:start + chunk] for value in row])
+        if full < len(rows):
+            conn.executemany(_INSERT_SQL[table], rows[full:])
+    
+    def _apply_retention(self):
+        """Delete rows older than the retention window and release freed pages."""
+        self._last_retention = _now()
+        if not self.retention_days:
+            return
+        
+        cutoff_time = int((self._last_retention - self.retention_days * 86400) * _TIMESTAMP_SCALE)
+        try:
+            with self._transaction() as conn:
+                for table in tuple(_INSERT_SQL) + tuple(_ROLLUP_UPSERT_SQL):
+                    conn.execute(f'DELETE FROM {table} WHERE timestamp < ?', (cutoff_time,))
+            with self.lock:
+                # Reclaim a bounded number of pages without a full VACUUM
+                self.conn.execute('PRAGMA incremental_vacuum(100)').fetchall()
+        except sqlite3.Error as e:
+            print(f"Database retention error: {e}")
+    
+    def _checkpoint(self):
+        """Copy the WAL back into the database and truncate it."""
+        self._last_checkpoint = _now()
+        if self.db_path == ':memory:':
+            return
+        
+        try:
+            with self.lock:
+                self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
+        except sqlite3.Error as e:
+            print(f"Database checkpoint error: {e}")
+    
+    def flush(self, timeout: float = _FLUSH_TIMEOUT) -> bool:
+        """Block until every queued row is written, or timeout. Returns False on timeout."""
+        # Nothing can be pending without a writer (rows then go straight to disk)
+        if self._closed or not self._writer.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        if not done.wait(timeout):
+            print("Database flush timed out")
+            return False
+        return True
+    
+    def get_network_history(self, seconds: int = 3600,
+                            adapter: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Get network stats history for the last N seconds as column arrays, optionally for one adapter."""
+        cutoff_time = int((_now() - seconds) * _TIMESTAMP_SCALE)
+        
+        self.flush(_READ_FLUSH_TIMEOUT)
+        with self._reader() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT timestamp, adapter_name, upload_speed, download_speed, 
-                       ping_latency, bytes_sent, bytes_received
-                FROM network_stats
-                WHERE timestamp >= ?
-                ORDER BY timestamp ASC
-            ''', (cutoff_time,))
+            if adapter is None:
+                cursor.execute(_NETWORK_HISTORY_SQL, (cutoff_time,))
+            else:
+                cursor.execute(_NETWORK_ADAPTER_HISTORY_SQL, (adapter, cutoff_time))
             
             rows = cursor.fetchall()
-            conn.close()
-            
-            return [
-                {
-                    'timestamp': row[0],
-                    'adapter_name': row[1],
-                    'upload_speed': row[2],
-                    'download_speed': row[3],
-                    'ping_latency': row[4],
-                    'bytes_sent': row[5],
-                    'bytes_received': row[6]
-                }
-                for row in rows
-            ]
+        
+        return _rows_to_columns(rows, _NETWORK_HISTORY_COLUMNS)
     
-    def get_system_history(self, seconds: int = 3600) -> List[Dict]:
-        """Get system stats history for the last N seconds."""
-        cutoff_time = datetime.now().timestamp() - seconds
+    def get_system_history(self, seconds: int = 3600,
+                           max_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Get system stats history for the last N seconds as column arrays.
         
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
+        With max_points, reads from the coarsest rollup table whose bucket
+        still resolves the window into at least that many points.
+        """
+        cutoff_time = int((_now() - seconds) * _TIMESTAMP_SCALE)
+        
+        table = 'system_stats'
+        if max_points:
+            for rollup, bucket in _SYSTEM_ROLLUPS:
+                if bucket <= seconds / max_points:
+                    table = rollup
+                    break
+        
+        self.flush(_READ_FLUSH_TIMEOUT)
+        with self._reader() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT timestamp, cpu_usage, ram_usage, disk_usage, uptime
-                FROM system_stats
-                WHERE timestamp >= ?
-                ORDER BY timestamp ASC
-            ''', (cutoff_time,))
+            cursor.execute(_SYSTEM_HISTORY_SQL[table], (cutoff_time,))
             
             rows = cursor.fetchall()
-            conn.close()
-            
-            return [
-                {
-                    'timestamp': row[0],
-                    'cpu_usage': row[1],
-                    'ram_usage': row[2],
-                    'disk_usage': row[3],
-                    'uptime': row[4]
-                }
-                for row in rows
-            ]
+        
+        return _rows_to_columns(rows, _SYSTEM_HISTORY_COLUMNS)
     
     def get_recent_events(self, limit: int = 100) -> List[Dict]:
         """Get recent events."""
-        with self.lock:
-            conn = sqlite3.connect(self.db_path)
+        self.flush(_READ_FLUSH_TIMEOUT)
+        with self._reader() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT timestamp, event_type, message
-                FROM events
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (limit,))
+            cursor.execute(_RECENT_EVENTS_SQL, (limit,))
             
             rows = cursor.fetchall()
-            conn.close()
             
             return [
                 {
@@ -271,37 +815,36 @@ class DataManager:
                 for row in reversed(rows)  # Return in chronological order
             ]
     
+    def _execute_export(self, cursor: sqlite3.Cursor, table: str,
+                        seconds: Optional[int]) -> Tuple[str, ...]:
+        """Run the export query for a table and return its column names."""
+        if table not in _EXPORT_SQL:
+            raise ValueError(f"Unknown table: {table}")
+        
+        if seconds:
+            cutoff_time = int((_now() - seconds) * _TIMESTAMP_SCALE)
+            cursor.execute(_EXPORT_SINCE_SQL[table], (cutoff_time,))
+        else:
+            cursor.execute(_EXPORT_SQL[table])
+        return _EXPORT_COLUMNS[table]
+    
     def export_to_csv(self, output_path: str, table: str = "network_stats", 
                      seconds: Optional[int] = None) -> bool:
         """Export data to CSV file."""
         try:
             import csv
             
-            cutoff_time = None
-            if seconds:
-                cutoff_time = datetime.now().timestamp() - seconds
-            
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            self.flush()
+            with self._reader() as conn:
                 cursor = conn.cursor()
+                columns = self._execute_export(cursor, table, seconds)
                 
-                if cutoff_time:
-                    cursor.execute(f'SELECT * FROM {table} WHERE timestamp >= ?', (cutoff_time,))
-                else:
-                    cursor.execute(f'SELECT * FROM {table}')
-                
-                rows = cursor.fetchall()
-                
-                # Get column names
-                cursor.execute(f'PRAGMA table_info({table})')
-                columns = [col[1] for col in cursor.fetchall()]
-                
-                conn.close()
-            
-            with open(output_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(columns)
-                writer.writerows(rows)
+                # Stream rows straight from the cursor so memory use does not
+                # grow with the table size
+                with open(output_path, 'w', newline='', buffering=1 << 20) as f:
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    writer.writerows(cursor)
             
             return True
         except Exception as e:
@@ -312,33 +855,50 @@ class DataManager:
                       seconds: Optional[int] = None) -> bool:
         """Export data to JSON file."""
         try:
-            cutoff_time = None
-            if seconds:
-                cutoff_time = datetime.now().timestamp() - seconds
-            
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
+            self.flush()
+            with self._reader() as conn:
                 cursor = conn.cursor()
+                columns = self._execute_export(cursor, table, seconds)
                 
-                if cutoff_time:
-                    cursor.execute(f'SELECT * FROM {table} WHERE timestamp >= ?', (cutoff_time,))
-                else:
-                    cursor.execute(f'SELECT * FROM {table}')
-                
-                rows = cursor.fetchall()
-                
-                # Get column names
-                cursor.execute(f'PRAGMA table_info({table})')
-                columns = [col[1] for col in cursor.fetchall()]
-                
-                conn.close()
-            
-            data = [dict(zip(columns, row)) for row in rows]
-            
-            with open(output_path, 'w') as f:
-                json.dump(data, f, indent=2)
+                # Emit the array one object at a time, fetching rows in
+                # chunks, instead of building the whole list in memory
+                with open(output_path, 'wb', buffering=1 << 20) as f:
+                    f.write(b'[')
+                    separator = b'\n  '
+                    while True:
+                        rows = cursor.fetchmany(10000)
+                        if not rows:
+                            break
+                        for row in rows:
+                            f.write(separator)
+                            f.write(_json_dumps(dict(zip(columns, row))))
+                            separator = b',\n  '
+                    f.write(b'\n]\n')
             
             return True
         except Exception as e:
             print(f"Export error: {e}")
             return False
+    
+    def close(self):
+        """Write out queued rows, stop the writer thread and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        
+        done = threading.Event()
+        self._queue.put((_STOP, done))
+        self._writer.join(_FLUSH_TIMEOUT)
+        if self._writer.is_alive():
+            print("Database writer did not stop, queued rows may be lost")
+        with self.lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+            try:
+                # Refresh planner statistics for indexes that need it
+                self.conn.execute('PRAGMA optimize')
+            except sqlite3.Error as e:
+                print(f"Database optimize error: {e}")
+            self.conn.close()
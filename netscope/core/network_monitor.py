@@ -1,105 +1,433 @@
 """
 Network Monitor - Monitors network adapters, speeds, ping, and public IP information.
 """
+import json
+import math
+import os
 import psutil
 import time
 import requests
-import subprocess
-import platform
+import random
+import re
+import select
+import struct
 from typing import Dict, List, Optional, Tuple
-from threading import Thread, Event
+from threading import Event, Lock
+from concurrent.futures import ThreadPoolExecutor
 import socket
 
+try:
+    import speedtest  # from the speedtest-cli package
+except ImportError:
+    speedtest = None
+
+from .. import __version__
+from .data_manager import get_base_path
+
+
+# Bytes -> megabits (binary mega, as displayed in the UI)
+_BYTES_TO_MBIT = 8 / (1024 * 1024)
+
+# Seconds between background ping measurements
+PING_INTERVAL = 5.0
+
+# Seconds one interface counter snapshot is shared by every caller, so the
+# UI's several reads per tick cost a single /proc/net/dev read
+COUNTERS_TTL = 0.5
+
+# Seconds an adapter listing is reused before psutil is queried again; the
+# (costlier, rarely changing) address enumeration is refreshed less often
+ADAPTER_CACHE_TTL = 10.0
+ADDR_CACHE_TTL = 60.0
+
+# Seconds a public IP/ISP/location lookup is reused before refreshing
+PUBLIC_INFO_TTL = 3600.0
+
+# Seconds the on-disk copy of the last ipinfo response is trusted; ISP and
+# location change on the order of days, so restarts reuse it.
+IPINFO_DISK_TTL = 86400.0
+
+# Seconds the speed test server chosen by the last run is reused, skipping
+# the server list download and latency sweep
+SPEEDTEST_SERVER_TTL = 1800.0
+
+# First retry delay after a failed lookup; doubles per failure up to the TTL
+PUBLIC_INFO_RETRY = 60.0
+
+# One pooled keep-alive session for every lookup, so refreshes reuse the
+# TLS connection instead of handshaking again
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=2))
+_SESSION.headers['User-Agent'] = f'netscope/{__version__}'
+
+# Platform-specific ping invocation, resolved once at import; the count and
+# host are appended per call. Waits at most one second for each reply.
+_IS_WINDOWS = os.name == 'nt'
+_PING_CMD = ['ping', '-w', '1000', '-n'] if _IS_WINDOWS else ['ping', '-W', '1', '-c']
+
+# Round-trip time in ping output, matched against the raw bytes
+_PING_RE_WINDOWS = re.compile(rb'time[<=](\d+)ms')    # "time=12ms" / "time<1ms"
+_PING_RE_POSIX = re.compile(rb'time=([\d.]+) ms')    # "time=12.3 ms"
+
+
+def _parse_windows(output: bytes) -> Optional[float]:
+    """Extract the round-trip time in ms from Windows ping output."""
+    match = _PING_RE_WINDOWS.search(output)
+    return float(match.group(1)) if match else None
+
+
+def _parse_posix(output: bytes) -> Optional[float]:
+    """Extract the round-trip time in ms from POSIX ping output."""
+    match = _PING_RE_POSIX.search(output)
+    return float(match.group(1)) if match else None
+
+
+# Parser for this platform's ping, chosen once at import
+_parse_ping = _parse_windows if _IS_WINDOWS else _parse_posix
+
+# DNS query for the root NS records (header minus the 2-byte id, then the
+# question); one small UDP packet that any resolver answers.
+_DNS_QUERY = b'\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01'
+
+# ICMP echo request/reply types
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """16-bit one's-complement checksum of an ICMP message."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _parse_icmp_reply(reply: bytes) -> Tuple[int, int]:
+    """Return the (type, sequence) of an ICMP message, with or without its IPv4 header."""
+    # Linux strips the IP header on datagram ICMP sockets, macOS keeps it
+    offset = (reply[0] & 0x0F) * 4 if reply[0] >> 4 == 4 else 0
+    reply_type, _, _, _, seq = struct.unpack_from('!BBHHH', reply, offset)
+    return reply_type, seq
+
+
+# Linux exposes every interface's counters in this one file
+_PROC_NET_DEV = '/proc/net/dev'
+_HAVE_PROC_NET_DEV = os.path.exists(_PROC_NET_DEV)
+
+# Raw /proc/net/dev values from the previous read, and the amount added back
+# per interface after its counters wrapped or were reset (psutil's nowrap)
+_raw_counters: Dict[str, Tuple[int, int]] = {}
+_counter_offsets: Dict[str, List[int]] = {}
+_counters_lock = Lock()
+
+
+def _unwrap_counters(raw: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int]]:
+    """Make raw counters monotonic across wraps and interface resets."""
+    counters = {}
+    with _counters_lock:
+        for name, values in raw.items():
+            previous = _raw_counters.get(name)
+            offsets = _counter_offsets.setdefault(name, [0, 0])
+            if previous is not None:
+                for i in (0, 1):
+                    if values[i] < previous[i]:
+                        # Went backwards: carry the lost total forward
+                        offsets[i] += previous[i]
+            _raw_counters[name] = values
+            counters[name] = (values[0] + offsets[0], values[1] + offsets[1])
+    return counters
+
+
+def _read_interface_counters() -> Dict[str, Tuple[int, int]]:
+    """Get (bytes_sent, bytes_recv) per interface.
+    
+    On Linux this is a single read of /proc/net/dev; elsewhere it falls
+    back to psutil. Either way counters never decrease: wraps and resets
+    are folded in as psutil's nowrap does.
+    """
+    if _HAVE_PROC_NET_DEV:
+        with open(_PROC_NET_DEV, 'rb') as f:
+            lines = f.read().splitlines()[2:]  # Skip the two header lines
+        counters = {}
+        for line in lines:
+            name, _, fields = line.partition(b':')
+            fields = fields.split()
+            # Receive block comes first: bytes_recv is field 0, bytes_sent field 8
+            counters[name.strip().decode()] = (int(fields[8]), int(fields[0]))
+        return _unwrap_counters(counters)
+    
+    return {
+        name: (io.bytes_sent, io.bytes_recv)
+        for name, io in psutil.net_io_counters(pernic=True, nowrap=True).items()
+    }
+
 
 class NetworkMonitor:
     """Monitors network interfaces and statistics."""
     
+    _instance: Optional['NetworkMonitor'] = None
+    _instance_lock = Lock()
+    
+    @classmethod
+    def instance(cls) -> 'NetworkMonitor':
+        """Return the shared monitor, creating it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
     def __init__(self):
         """Initialize network monitor."""
         self.running = False
         self.stop_event = Event()
         self.last_bytes_sent = 0
         self.last_bytes_recv = 0
-        self.last_time = time.time()
+        self.last_time = time.monotonic()
         self.current_adapter = None
+        self._last_bytes_adapter = None  # adapter the last_bytes_* baseline belongs to
+        self._last_speeds: Tuple[float, float] = (0.0, 0.0)
+        # (time.monotonic() of the read, {interface: (bytes_sent, bytes_recv)})
+        self._counters_cache: Tuple[float, Optional[Dict[str, Tuple[int, int]]]] = (0.0, None)
         self.public_ip = None
         self.isp_name = None
         self.location = None
-        self._fetch_public_info()
+        self._next_fetch_at = 0.0
+        self._fetch_backoff = PUBLIC_INFO_RETRY
+        self._fetch_lock = Lock()
+        # (time.monotonic() chosen, server dict) from the last library speed test
+        self._st_server: Tuple[float, Optional[Dict]] = (0.0, None)
+        self._adapters_cache: List[Dict] = []
+        self._adapters_cache_ts = -math.inf
+        self._addr_cache: Dict[str, Optional[str]] = {}
+        self._addr_cache_ts = -math.inf
+        # (adapter listing timestamp it was derived from, primary adapter)
+        self._primary_adapter_cache: Tuple[float, Optional[str]] = (-1.0, None)
+        
+        # All background work (public IP lookups and ping probes) shares one
+        # small pool, so nothing blocks construction or a stats sample.
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="netscope-net")
+        self.refresh_public_info()
+        
+        # Latest (time.monotonic(), ms) ping result, refreshed through the pool at
+        # most every PING_INTERVAL seconds by get_network_stats
+        self._ping_cache: Tuple[float, float] = (-math.inf, math.nan)
+        self._ping_future = None
+        
+        # Unprivileged ICMP socket, created on first use; None with
+        # _icmp_available False once the OS has refused one
+        self._icmp_sock: Optional[socket.socket] = None
+        self._icmp_available = True
+        self._icmp_seq = 0
+        # Guards the socket's lifetime; _icmp_users counts probes using it
+        self._icmp_lock = Lock()
+        self._icmp_users = 0
+    
+    def _refresh_ping(self):
+        """Submit a ping probe to the pool if the cached result is stale."""
+        if self._ping_future is not None and not self._ping_future.done():
+            return
+        if time.monotonic() - self._ping_cache[0] >= PING_INTERVAL:
+            self._ping_future = self._submit(self._measure_ping)
+    
+    def _measure_ping(self):
+        """Run a ping probe and cache its result."""
+        if self.stop_event.is_set():
+            return
+        self._ping_cache = (time.monotonic(), self.get_ping_latency())
+    
+    def _submit(self, fn):
+        """Run fn on the pool, or return None once the monitor is stopped."""
+        if self.stop_event.is_set():
+            return None
+        try:
+            return self._pool.submit(fn)
+        except RuntimeError:
+            # Lost a race with stop() shutting the pool down
+            return None
+    
+    def stop(self):
+        """Stop background lookups and probes.
+        
+        A stopped monitor is detached from the singleton, so the next
+        instance() call builds a fresh one with a working pool.
+        """
+        cls = type(self)
+        with cls._instance_lock:
+            if cls._instance is self:
+                cls._instance = None
+        self.running = False
+        self.stop_event.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._icmp_lock:
+            if not self._icmp_users:
+                self._close_icmp_if_done()
+    
+    def refresh_public_info(self):
+        """Refresh public IP info in the background if the last lookup is stale."""
+        now = time.monotonic()
+        if now >= self._next_fetch_at:
+            # Pushed out again by the lookup itself; this just stops
+            # duplicate submissions while it is in flight.
+            self._next_fetch_at = now + PUBLIC_INFO_TTL
+            self._submit(self._fetch_public_info)
     
     def _fetch_public_info(self):
-        """Fetch public IP, ISP, and location from ipinfo.io API."""
+        """Fetch public IP, ISP, and location, backing off after failures."""
+        # Concurrent callers share the one in-flight lookup
+        with self._fetch_lock:
+            self._fetch_public_info_locked()
+    
+    def _fetch_public_info_locked(self):
+        """Fetch public IP info and schedule the next lookup. Caller holds _fetch_lock."""
+        if self._load_cached_ipinfo() or self._do_fetch_public_info():
+            self._fetch_backoff = PUBLIC_INFO_RETRY
+            self._next_fetch_at = time.monotonic() + PUBLIC_INFO_TTL
+        else:
+            # Offline or rate limited: retry later with jittered exponential
+            # backoff instead of spending a timeout (and quota) every refresh
+            delay = self._fetch_backoff * random.uniform(0.8, 1.2)
+            self._next_fetch_at = time.monotonic() + delay
+            self._fetch_backoff = min(self._fetch_backoff * 2, PUBLIC_INFO_TTL)
+    
+    def _ipinfo_cache_path(self) -> str:
+        """Path of the on-disk ipinfo cache, next to the database."""
+        return os.path.join(get_base_path(), "data", "ipinfo.json")
+    
+    def _load_cached_ipinfo(self) -> bool:
+        """Apply the on-disk ipinfo response if it is fresh. Returns True on a hit."""
+        path = self._ipinfo_cache_path()
+        try:
+            if time.time() - os.path.getmtime(path) >= IPINFO_DISK_TTL:
+                return False
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        self._apply_ipinfo(data)
+        return True
+    
+    def _save_cached_ipinfo(self, data: Dict):
+        """Write the ipinfo response to disk atomically."""
+        path = self._ipinfo_cache_path()
+        tmp_path = path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to cache public IP info: {e}")
+    
+    def _apply_ipinfo(self, data: Dict):
+        """Set public IP, ISP, and location from an ipinfo.io response."""
+        self.public_ip = data.get('ip', 'Unknown')
+        self.isp_name = data.get('org', 'Unknown')
+        location_parts = []
+        if data.get('city'):
+            location_parts.append(data['city'])
+        if data.get('region'):
+            location_parts.append(data['region'])
+        if data.get('country'):
+            location_parts.append(data['country'])
+        self.location = ', '.join(location_parts) if location_parts else 'Unknown'
+    
+    def _do_fetch_public_info(self) -> bool:
+        """Fetch public IP, ISP, and location from ipinfo.io API. Returns True on success."""
         try:
             # Try ipinfo.io first (free tier: 50k requests/month)
-            response = requests.get('https://ipinfo.io/json', timeout=5)
+            response = _SESSION.get('https://ipinfo.io/json', timeout=5, allow_redirects=False)
             if response.status_code == 200:
                 data = response.json()
-                self.public_ip = data.get('ip', 'Unknown')
-                self.isp_name = data.get('org', 'Unknown')
-                location_parts = []
-                if data.get('city'):
-                    location_parts.append(data['city'])
-                if data.get('region'):
-                    location_parts.append(data['region'])
-                if data.get('country'):
-                    location_parts.append(data['country'])
-                self.location = ', '.join(location_parts) if location_parts else 'Unknown'
+                self._apply_ipinfo(data)
+                self._save_cached_ipinfo(data)
+                return True
+            return False
         except Exception as e:
             print(f"Failed to fetch public IP info: {e}")
             # Fallback to simple IP check
             try:
-                response = requests.get('https://api.ipify.org?format=json', timeout=5)
+                response = _SESSION.get('https://api.ipify.org?format=json', timeout=5)
                 if response.status_code == 200:
                     self.public_ip = response.json().get('ip', 'Unknown')
             except:
                 self.public_ip = 'Unknown'
             self.isp_name = 'Unknown'
             self.location = 'Unknown'
+            return False
     
     def get_active_adapters(self) -> List[Dict]:
-        """Get all active network adapters."""
+        """Get all active network adapters (cached for ADAPTER_CACHE_TTL seconds)."""
+        now = time.monotonic()
+        if now - self._adapters_cache_ts < ADAPTER_CACHE_TTL:
+            return self._adapters_cache
+        
+        # First IPv4 address per interface, from the slower address cache
+        if now - self._addr_cache_ts >= ADDR_CACHE_TTL:
+            self._addr_cache = {
+                interface_name: next(
+                    (addr.address for addr in addresses if addr.family == socket.AF_INET), None
+                )
+                for interface_name, addresses in psutil.net_if_addrs().items()
+            }
+            self._addr_cache_ts = now
+        
         adapters = []
-        interfaces = psutil.net_if_addrs()
         stats = psutil.net_if_stats()
         
-        for interface_name, addresses in interfaces.items():
+        for interface_name, ip_address in self._addr_cache.items():
             # Skip loopback
             if interface_name == 'lo' or interface_name.startswith('Loopback'):
                 continue
             
-            # Check if interface is up
-            if interface_name in stats:
-                stat = stats[interface_name]
-                if stat.isup:
-                    # Get IP address
-                    ip_address = None
-                    for addr in addresses:
-                        if addr.family == socket.AF_INET:
-                            ip_address = addr.address
-                            break
-                    
-                    adapters.append({
-                        'name': interface_name,
-                        'ip': ip_address or 'No IP',
-                        'isup': stat.isup,
-                        'speed': stat.speed if stat.speed > 0 else 'Unknown'
-                    })
+            # Check if interface is up (one dict lookup instead of two)
+            stat = stats.get(interface_name)
+            if stat is None or not stat.isup:
+                continue
+            
+            adapters.append({
+                'name': interface_name,
+                'ip': ip_address or 'No IP',
+                'isup': stat.isup,
+                'speed': stat.speed if stat.speed > 0 else 'Unknown'
+            })
         
+        self._adapters_cache = adapters
+        self._adapters_cache_ts = now
         return adapters
     
+    def _get_counters(self) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+        """Get the current counter snapshot and its read time, re-reading after COUNTERS_TTL."""
+        now = time.monotonic()
+        read_at, counters = self._counters_cache
+        if counters is None or now - read_at >= COUNTERS_TTL:
+            read_at, counters = now, _read_interface_counters()
+            self._counters_cache = (read_at, counters)
+        return read_at, counters
+    
+    def invalidate_adapter_cache(self):
+        """Force the next adapter lookup to query psutil again."""
+        self._adapters_cache_ts = -math.inf
+        self._addr_cache_ts = -math.inf
+    
     def get_primary_adapter(self) -> Optional[str]:
-        """Get the primary active network adapter."""
+        """Get the primary active network adapter (memoized per adapter listing)."""
         adapters = self.get_active_adapters()
-        if not adapters:
-            return None
+        if self._primary_adapter_cache[0] == self._adapters_cache_ts:
+            return self._primary_adapter_cache[1]
         
-        # Prefer adapters with IP addresses
-        for adapter in adapters:
-            if adapter['ip'] != 'No IP':
-                return adapter['name']
+        primary = None
+        if adapters:
+            # Prefer adapters with IP addresses, else the first adapter
+            primary = next(
+                (adapter['name'] for adapter in adapters if adapter['ip'] != 'No IP'),
+                adapters[0]['name']
+            )
         
-        # Fallback to first adapter
-        return adapters[0]['name']
+        self._primary_adapter_cache = (self._adapters_cache_ts, primary)
+        return primary
     
     def get_network_stats(self) -> Dict:
         """Get current network statistics for the primary adapter."""
@@ -113,39 +441,45 @@ class NetworkMonitor:
                 'download_speed': 0.0,
                 'bytes_sent': 0.0,
                 'bytes_received': 0.0,
-                'ping_latency': 0.0,
+                'ping_latency': math.nan,
                 'public_ip': self.public_ip or 'Unknown',
                 'isp_name': self.isp_name or 'Unknown',
                 'location': self.location or 'Unknown'
             }
         
         try:
-            net_io = psutil.net_io_counters(pernic=True)
-            if self.current_adapter not in net_io:
-                return self.get_network_stats()
+            # Rates use the snapshot's own read time, on the monotonic clock
+            # so wall-clock adjustments cannot skew them
+            current_time, counters = self._get_counters()
+            if self.current_adapter not in counters:
+                raise KeyError(f"adapter {self.current_adapter} not found")
             
-            current_bytes_sent = net_io[self.current_adapter].bytes_sent
-            current_bytes_recv = net_io[self.current_adapter].bytes_recv
-            current_time = time.time()
+            current_bytes_sent, current_bytes_recv = counters[self.current_adapter]
             
+            # Byte deltas stay ints; one factor converts them straight to Mbps
             time_diff = current_time - self.last_time
-            if time_diff > 0:
-                upload_speed = (current_bytes_sent - self.last_bytes_sent) / time_diff
-                download_speed = (current_bytes_recv - self.last_bytes_recv) / time_diff
+            if self._last_bytes_adapter != self.current_adapter:
+                # No baseline for this adapter yet (startup or a switch)
+                upload_mbps = download_mbps = 0.0
+                self._last_speeds = (0.0, 0.0)
+                self._last_bytes_adapter = self.current_adapter
+            elif time_diff > 0:
+                scale = _BYTES_TO_MBIT / time_diff
+                # Counters are unwrapped, but never report a negative rate
+                upload_mbps = max(current_bytes_sent - self.last_bytes_sent, 0) * scale
+                download_mbps = max(current_bytes_recv - self.last_bytes_recv, 0) * scale
+                self._last_speeds = (upload_mbps, download_mbps)
             else:
-                upload_speed = 0.0
-                download_speed = 0.0
+                # Same snapshot as the previous call: repeat its rates
+                upload_mbps, download_mbps = self._last_speeds
             
             self.last_bytes_sent = current_bytes_sent
             self.last_bytes_recv = current_bytes_recv
             self.last_time = current_time
             
-            # Convert to Mbps
-            upload_mbps = (upload_speed * 8) / (1024 * 1024)
-            download_mbps = (download_speed * 8) / (1024 * 1024)
-            
-            # Get ping latency
-            ping_latency = self.get_ping_latency()
+            # Latest ping from the pool; schedules a new probe when stale
+            self._refresh_ping()
+            ping_latency = self._ping_cache[1]
             
             return {
                 'adapter_name': self.current_adapter,
@@ -160,72 +494,174 @@ class NetworkMonitor:
             }
         except Exception as e:
             print(f"Error getting network stats: {e}")
+            adapter_name = self.current_adapter or 'Error'
+            # The adapter may have gone away: rescan and reselect next tick
+            self.invalidate_adapter_cache()
+            self.current_adapter = None
             return {
-                'adapter_name': self.current_adapter or 'Error',
+                'adapter_name': adapter_name,
                 'upload_speed': 0.0,
                 'download_speed': 0.0,
                 'bytes_sent': 0.0,
                 'bytes_received': 0.0,
-                'ping_latency': 0.0,
+                'ping_latency': math.nan,
                 'public_ip': self.public_ip or 'Unknown',
                 'isp_name': self.isp_name or 'Unknown',
                 'location': self.location or 'Unknown'
             }
     
     def get_ping_latency(self, host: str = "8.8.8.8", count: int = 1) -> float:
-        """Get ping latency to a host."""
-        try:
-            system = platform.system().lower()
-            
-            if system == "windows":
-                cmd = ["ping", "-n", str(count), "-w", "1000", host]
-            else:
-                cmd = ["ping", "-c", str(count), "-W", "1", host]
+        """Get ping latency to a host in ms, or NaN when no reply came back.
+        
+        NaN is stored as NULL, so a lost probe never reads as a 0 ms ping.
+        """
+        # A real ICMP echo where the OS allows unprivileged ping sockets.
+        # A lost reply is a real result, so the slower probes only run
+        # when the OS refuses ICMP altogether.
+        for _ in range(max(count, 1)):
+            latency = self._icmp_ping(host)
+            if latency is not None:
+                return latency
+            if not self._icmp_available:
+                break
+        else:
+            return math.nan
+        
+        # A timed DNS query is one UDP round trip and still avoids forking
+        # a ping process
+        latency = self._dns_ping(host)
+        if latency is not None:
+            return latency
+        
+        # Fallback: system ping (e.g. the host is not a DNS resolver)
+        return self._subprocess_ping(host, count)
+    
+    def _icmp_ping(self, host: str, timeout: float = 1.0) -> Optional[float]:
+        """Time one ICMP echo to host in ms, or None if unavailable or lost.
+        
+        _icmp_available is cleared when the OS refuses ICMP, so callers can
+        tell that apart from a lost reply.
+        """
+        with self._icmp_lock:
+            if self.stop_event.is_set():
+                return None
+            if self._icmp_sock is None:
+                if not self._icmp_available:
+                    return None
+                try:
+                    # Datagram ICMP needs no root on Linux (net.ipv4.ping_group_range)
+                    # and macOS; Windows and restricted hosts refuse it.
+                    self._icmp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+                    self._icmp_sock.setblocking(False)
+                except OSError:
+                    self._icmp_available = False
+                    return None
             
+            # Probe through a local reference; stop() leaves the socket to the
+            # last probe in flight, which closes it on the way out
+            sock = self._icmp_sock
+            self._icmp_users += 1
+            self._icmp_seq = (self._icmp_seq + 1) & 0xFFFF
+            seq = self._icmp_seq
+        
+        ident = os.getpid() & 0xFFFF  # Linux substitutes the socket's own id
+        header = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+        payload = b'netscope'
+        checksum = _icmp_checksum(header + payload)
+        packet = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+        
+        try:
+            start = time.perf_counter()
+            sock.sendto(packet, (host, 0))
+            deadline = start + timeout
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                ready, _, _ = select.select([sock], [], [], remaining)
+                if not ready:
+                    return None
+                # Drain every queued datagram per wakeup, so late replies to
+                # earlier timed-out probes don't each cost another select()
+                while True:
+                    try:
+                        reply = sock.recv(1024)
+                    except BlockingIOError:
+                        break
+                    reply_type, reply_seq = _parse_icmp_reply(reply)
+                    if reply_type == _ICMP_ECHO_REPLY and reply_seq == seq:
+                        return (time.perf_counter() - start) * 1000  # Convert to ms
+        except PermissionError:
+            # EPERM/EACCES on send: ICMP is filtered for this process
+            self._icmp_available = False
+            return None
+        except OSError:
+            return None
+        finally:
+            with self._icmp_lock:
+                self._icmp_users -= 1
+                if not self._icmp_users:
+                    self._close_icmp_if_done()
+    
+    def _close_icmp_if_done(self):
+        """Close the ICMP socket once stopped or refused. Caller holds _icmp_lock."""
+        if self._icmp_sock is not None and (self.stop_event.is_set() or not self._icmp_available):
+            self._icmp_sock.close()
+            self._icmp_sock = None
+    
+    def _dns_ping(self, host: str, timeout: float = 1.0) -> Optional[float]:
+        """Time a DNS query to host:53 over UDP in ms, or None if it fails."""
+        query_id = os.urandom(2)
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.settimeout(timeout)
+                # Connected UDP so an ICMP unreachable surfaces as an error
+                sock.connect((host, 53))
+                start = time.perf_counter()
+                sock.send(query_id + _DNS_QUERY)
+                while True:
+                    reply = sock.recv(512)
+                    if reply[:2] == query_id:
+                        return (time.perf_counter() - start) * 1000  # Convert to ms
+        except OSError:
+            return None
+    
+    def _subprocess_ping(self, host: str, count: int) -> float:
+        """Get ping latency by running the system ping command."""
+        # Only reached when both socket probes fail, so the import is deferred
+        import subprocess
+        try:
             result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+                _PING_CMD + [str(count), host],
+                # Only stdout is parsed: no stderr pipe, and no inherited stdin
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 timeout=5
             )
             
             if result.returncode == 0:
-                output = result.stdout
-                # Parse ping output (simplified)
-                if "time=" in output or "time<" in output:
-                    # Extract time value
-                    import re
-                    if system == "windows":
-                        pattern = r'time[<=](\d+)ms'
-                    else:
-                        pattern = r'time=([\d.]+)\s*ms'
-                    
-                    match = re.search(pattern, output)
-                    if match:
-                        return float(match.group(1))
+                latency = _parse_ping(result.stdout)
+                if latency is not None:
+                    return latency
             
-            # Fallback: try socket connection
-            start = time.time()
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            try:
-                sock.connect((host, 80))
-                latency = (time.time() - start) * 1000  # Convert to ms
-                sock.close()
-                return latency
-            except:
-                return 0.0
+            return math.nan
         except Exception as e:
-            return 0.0
+            return math.nan
     
     def run_speed_test(self) -> Optional[Dict]:
         """Run a speed test using speedtest-cli."""
         try:
-            # Try importing speedtest module (from speedtest-cli package)
-            try:
-                import speedtest
+            # Run in-process when the speedtest module is available
+            if speedtest is not None:
                 st = speedtest.Speedtest()
-                st.get_best_server()
+                # Re-measure only the recently chosen server while it is fresh
+                chosen_at, server = self._st_server
+                if server is not None and time.monotonic() - chosen_at < SPEEDTEST_SERVER_TTL:
+                    st.get_best_server([server])
+                else:
+                    st.get_best_server()
+                    self._st_server = (time.monotonic(), dict(st.results.server))
                 
                 download_speed = st.download() / 1000000  # Convert to Mbps
                 upload_speed = st.upload() / 1000000  # Convert to Mbps
@@ -240,10 +676,9 @@ class NetworkMonitor:
                     'ping_ms': round(ping, 2),
                     'server_name': server_name
                 }
-            except ImportError:
+            else:
                 # Fallback to CLI command
                 import subprocess
-                import json
                 result = subprocess.run(
                     ['speedtest-cli', '--json'],
                     capture_output=True,
@@ -266,7 +701,9 @@ class NetworkMonitor:
     def get_total_data_usage(self) -> Tuple[float, float]:
         """Get total data sent and received since app start in bytes."""
         try:
-            net_io = psutil.net_io_counters()
-            return net_io.bytes_sent, net_io.bytes_recv
+            # Totals over every interface, from the shared per-tick snapshot
+            _, counters = self._get_counters()
+            return (sum(sent for sent, _ in counters.values()),
+                    sum(recv for _, recv in counters.values()))
         except:
             return 0.0, 0.0
@@ -1,23 +1,56 @@
 """
 System Monitor - Monitors CPU, RAM, Disk usage and system uptime.
 """
+import os
 import psutil
+import shutil
 import time
-from typing import Dict
+from typing import Dict, Optional
 from datetime import timedelta
+from threading import Lock
+
+
+# Boot time does not change while the process runs
+_BOOT_TIME = psutil.boot_time()
+
+# Seconds a disk usage reading is reused; free space rarely moves sub-second
+DISK_CACHE_TTL = 5.0
+
+# Primary drive and how to read it, chosen once at import
+_DISK_PATH = 'C:\\' if os.name == 'nt' else '/'
+_HAVE_STATVFS = hasattr(os, 'statvfs')
 
 
 class SystemMonitor:
     """Monitors system resources and performance."""
     
+    _instance: Optional['SystemMonitor'] = None
+    _instance_lock = Lock()
+    
+    @classmethod
+    def instance(cls) -> 'SystemMonitor':
+        """Return the shared monitor, creating it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
     def __init__(self):
         """Initialize system monitor."""
-        self.boot_time = psutil.boot_time()
+        self.boot_time = _BOOT_TIME
+        self._disk_cache: Optional[Dict] = None
+        self._disk_cache_ts = 0.0
+        # Prime the CPU counters so the first non-blocking read has a baseline
+        psutil.cpu_percent(interval=None)
     
     def get_cpu_usage(self) -> float:
-        """Get current CPU usage percentage."""
+        """Get CPU usage percentage since the previous call.
+        
+        Non-blocking: the caller's polling interval is the sampling window,
+        so calls should be at least a few hundred ms apart.
+        """
         try:
-            return psutil.cpu_percent(interval=0.1)
+            return psutil.cpu_percent(interval=None)
         except:
             return 0.0
     
@@ -40,32 +73,35 @@ class SystemMonitor:
             }
     
     def get_disk_usage(self) -> Dict:
-        """Get disk usage for the primary drive."""
+        """Get disk usage for the primary drive, reused for DISK_CACHE_TTL seconds."""
+        now = time.monotonic()
+        if self._disk_cache is not None and now - self._disk_cache_ts < DISK_CACHE_TTL:
+            return self._disk_cache
         try:
-            disk = psutil.disk_usage('/')
-            return {
-                'total': disk.total,
-                'used': disk.used,
-                'free': disk.free,
-                'percent': (disk.used / disk.total) * 100
+            if _HAVE_STATVFS:
+                # statvfs directly, same arithmetic as psutil.disk_usage
+                st = os.statvfs(_DISK_PATH)
+                total = st.f_blocks * st.f_frsize
+                free = st.f_bavail * st.f_frsize
+                used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            else:
+                total, used, free = shutil.disk_usage(_DISK_PATH)
+            usage = {
+                'total': total,
+                'used': used,
+                'free': free,
+                'percent': (used / total) * 100
             }
         except:
-            # Try Windows drive
-            try:
-                disk = psutil.disk_usage('C:\\')
-                return {
-                    'total': disk.total,
-                    'used': disk.used,
-                    'free': disk.free,
-                    'percent': (disk.used / disk.total) * 100
-                }
-            except:
-                return {
-                    'total': 0,
-                    'used': 0,
-                    'free': 0,
-                    'percent': 0.0
-                }
+            usage = {
+                'total': 0,
+                'used': 0,
+                'free': 0,
+                'percent': 0.0
+            }
+        self._disk_cache = usage
+        self._disk_cache_ts = now
+        return usage
     
     def get_uptime(self) -> float:
         """Get system uptime in seconds."""
@@ -7,21 +7,27 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# High DPI scaling is configured through the environment so Qt picks up the
+# screen scale factor before any of its modules load.
+os.environ.setdefault("QT_ENABLE_HIGHDPI_SCALING", "1")
+os.environ.setdefault("QT_AUTO_SCREEN_SCALE_FACTOR", "1")
+
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
-from netscope.ui.main_window import MainWindow
 
 
 def main():
     """Main application entry point."""
-    # Enable High DPI scaling
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+    # No environment equivalent exists for high-resolution pixmaps
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
     app = QApplication(sys.argv)
     app.setApplicationName("NetScope")
     app.setApplicationVersion("1.0.0")
     
+    # Imported here so the monitoring/plotting stack loads after Qt is up
+    from netscope.ui.main_window import MainWindow
+    
     # Create and show main window
     window = MainWindow()
     window.show()
@@ -1,19 +1,26 @@
 """
 Main Window - PyQt5 GUI for NetScope network and system monitor.
 """
+import math
 import sys
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QLabel, QPushButton, QTextEdit, QComboBox, QGroupBox,
     QGridLayout, QSystemTrayIcon, QMenu, QAction,
     QApplication, QMessageBox, QProgressBar
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt5.QtCore import (
+    Qt, QEvent, QTimer, QThread, QThreadPool, QRunnable, QObject, QMetaObject,
+    pyqtSignal, pyqtSlot
+)
+from PyQt5 import sip
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
 
 from ..core.network_monitor import NetworkMonitor
 from ..core.system_monitor import SystemMonitor
@@ -22,24 +29,160 @@ from ..utils.logger import Logger
 from ..utils.exporter import Exporter
 
 
-class SpeedTestThread(QThread):
-    """Thread for running speed tests without blocking UI."""
+# Stylesheets shared by many widgets, built once
+_GROUPBOX_QSS = """
+    QGroupBox {
+        font-weight: bold;
+        border: 1px solid #555;
+        border-radius: 5px;
+        margin-top: 10px;
+        padding-top: 10px;
+        color: #ffffff;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+"""
+
+_BUTTON_QSS = """
+    QPushButton {
+        background: #0078d4;
+        color: #ffffff;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 3px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: #106ebe;
+    }
+    QPushButton:pressed {
+        background: #005a9e;
+    }
+"""
+
+_PROGRESS_QSS = """
+    QProgressBar {
+        border: 1px solid #555;
+        border-radius: 3px;
+        text-align: center;
+        color: #ffffff;
+        background: #2d2d2d;
+    }
+    QProgressBar::chunk {
+        background: #0078d4;
+        border-radius: 2px;
+    }
+"""
+
+_VALUE_LABEL_QSS = "color: #cccccc;"
+_ACCENT_LABEL_QSS = "color: #4ec9b0; font-size: 14px; font-weight: bold;"
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+class SpeedTestSignals(QObject):
+    """Signals for SpeedTestRunnable; a QRunnable cannot carry its own."""
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
+
+
+class SpeedTestRunnable(QRunnable):
+    """Speed test run on the shared thread pool without blocking UI."""
     
     def __init__(self, network_monitor):
         super().__init__()
         self.network_monitor = network_monitor
+        self.signals = SpeedTestSignals()
     
     def run(self):
         try:
             result = self.network_monitor.run_speed_test()
             if result:
-                self.finished.emit(result)
+                self.signals.finished.emit(result)
             else:
-                self.error.emit("Speed test failed")
+                self.signals.error.emit("Speed test failed")
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
+
+
+class StatsWorker(QObject):
+    """Collects monitor readings on a background thread for the UI."""
+    stats_ready = pyqtSignal(dict, dict)  # network stats, system stats
+    
+    def __init__(self, network_monitor, system_monitor):
+        super().__init__()
+        self.network_monitor = network_monitor
+        self.system_monitor = system_monitor
+    
+    @pyqtSlot()
+    def fetch(self):
+        network_stats = self.network_monitor.get_network_stats()
+        total_sent, total_recv = self.network_monitor.get_total_data_usage()
+        network_stats['total_usage'] = total_sent + total_recv
+        network_stats['adapters'] = self.network_monitor.get_active_adapters()
+        system_stats = self.system_monitor.get_all_stats()
+        self.stats_ready.emit(network_stats, system_stats)
+
+
+# Graph samples kept in memory: the longest time window (24 hours) at the 1 s
+# graph rate, doubled so a full buffer can drop its older half at once
+GRAPH_HISTORY = 2 * 86400
+
+
+def _decimate(times: np.ndarray, series: Tuple[np.ndarray, ...], width: int):
+    """Reduce samples to a min/max envelope of about two points per pixel.
+    
+    Each of `width` buckets contributes its minimum and maximum, placed at the
+    bucket's first and last time, so spikes survive at any zoom level. Series
+    short enough to draw as-is are returned unchanged.
+    """
+    if width <= 0 or len(times) <= 2 * width:
+        return times, series
+    bucket = len(times) // width
+    # Drop the few oldest samples that don't fill a whole bucket
+    start = len(times) - bucket * width
+    spans = times[start:].reshape(width, bucket)
+    envelope_times = np.stack((spans[:, 0], spans[:, -1]), axis=1).ravel()
+    envelopes = []
+    for values in series:
+        buckets = values[start:].reshape(width, bucket)
+        envelopes.append(np.stack((buckets.min(axis=1), buckets.max(axis=1)), axis=1).ravel())
+    return envelope_times, tuple(envelopes)
+
+
+class _SampleBuffer:
+    """Time-ordered samples in preallocated numpy arrays.
+    
+    When full, the older half is dropped with a single copy, so appends stay
+    amortized O(1) and window lookups are a binary search over the times.
+    """
+    
+    def __init__(self, *fields: str, capacity: int = GRAPH_HISTORY):
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.values = {field: np.empty(capacity, dtype=np.float32) for field in fields}
+        self.size = 0
+    
+    def append(self, timestamp: float, **values: float):
+        """Add one sample, all fields at once."""
+        if self.size == len(self.times):
+            keep = self.size // 2
+            self.times[:keep] = self.times[self.size - keep:self.size]
+            for column in self.values.values():
+                column[:keep] = column[self.size - keep:self.size]
+            self.size = keep
+        self.times[self.size] = timestamp
+        for field, value in values.items():
+            self.values[field][self.size] = value
+        self.size += 1
+    
+    def since(self, cutoff: float):
+        """Views of (times, {field: values}) for samples at or after cutoff."""
+        start = int(np.searchsorted(self.times[:self.size], cutoff))
+        return (self.times[start:self.size],
+                {field: column[start:self.size] for field, column in self.values.items()})
 
 
 class MainWindow(QMainWindow):
@@ -52,8 +195,8 @@ class MainWindow(QMainWindow):
         
         # Initialize core components
         self.data_manager = DataManager()
-        self.network_monitor = NetworkMonitor()
-        self.system_monitor = SystemMonitor()
+        self.network_monitor = NetworkMonitor.instance()
+        self.system_monitor = SystemMonitor.instance()
         self.logger = Logger(self.data_manager)
         self.exporter = Exporter(self.data_manager, self)
         
@@ -62,14 +205,24 @@ class MainWindow(QMainWindow):
         self.time_window = 3600  # seconds (1 hour default)
         self.app_start_time = datetime.now()
         self.speed_test_timer = None
-        self.speed_test_thread = None
+        self.speed_test_running = False
+        
+        # Short background jobs share one pool instead of owning threads. The
+        # window owns it rather than using the global pool, which Qt waits on
+        # at exit, so closing can drop queued jobs and bound the wait.
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(4)
+        self.speed_test_signals = None  # signals of the speed test in flight
+        self.label_cache = {}  # QLabel -> text last set by _set
+        self.progress_cache = {}  # QProgressBar -> value last set by _set_progress
         
         # Data storage for graphs
-        self.network_data = {'time': [], 'upload': [], 'download': []}
-        self.system_data = {'time': [], 'cpu': []}
+        self.network_data = _SampleBuffer('upload', 'download')
+        self.system_data = _SampleBuffer('cpu')
         
         # Setup UI
         self.setup_ui()
+        self.setup_stats_worker()
         self.setup_timers()
         self.setup_system_tray()
         self.apply_dark_theme()
@@ -82,9 +235,8 @@ class MainWindow(QMainWindow):
         self.logger.info(f"NetScope v{self.VERSION} started")
         self.logger.info("Initializing monitoring...")
         
-        # Initial update - use QTimer.singleShot to defer until event loop starts
-        from PyQt5.QtCore import QTimer as QtTimer
-        QtTimer.singleShot(100, self.update_all_stats)
+        # Initial update, queued so it runs once the worker thread is idle
+        QMetaObject.invokeMethod(self.stats_worker, 'fetch', Qt.QueuedConnection)
     
     def setup_ui(self):
         """Setup the user interface."""
@@ -129,14 +281,15 @@ class MainWindow(QMainWindow):
         self.tab_widget.addTab(overview_tab, "Overview")
         
         # Graphs tab
-        graphs_tab = self.create_graphs_tab()
-        self.tab_widget.addTab(graphs_tab, "Graphs")
+        self.graphs_tab_widget = self.create_graphs_tab()
+        self.tab_widget.addTab(self.graphs_tab_widget, "Graphs")
         
         # Logs & Export tab
         logs_tab = self.create_logs_tab()
         self.tab_widget.addTab(logs_tab, "Logs & Export")
         
         main_layout.addWidget(self.tab_widget)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
     
     def create_top_bar(self) -> QWidget:
         """Create top status bar."""
@@ -148,21 +301,21 @@ class MainWindow(QMainWindow):
         
         # System uptime
         self.uptime_label = QLabel("Uptime: --")
-        self.uptime_label.setStyleSheet("color: #cccccc;")
+        self.uptime_label.setStyleSheet(_VALUE_LABEL_QSS)
         layout.addWidget(self.uptime_label)
         
         layout.addStretch()
         
         # Public IP
         self.ip_label = QLabel("IP: --")
-        self.ip_label.setStyleSheet("color: #cccccc;")
+        self.ip_label.setStyleSheet(_VALUE_LABEL_QSS)
         layout.addWidget(self.ip_label)
         
         layout.addStretch()
         
         # Date/Time
         self.datetime_label = QLabel()
-        self.datetime_label.setStyleSheet("color: #cccccc;")
+        self.datetime_label.setStyleSheet(_VALUE_LABEL_QSS)
         layout.addWidget(self.datetime_label)
         
         # Refresh rate selector
@@ -192,110 +345,112 @@ class MainWindow(QMainWindow):
         
         # Network adapters section
         adapters_group = QGroupBox("Active Network Adapters")
-        adapters_group.setStyleSheet(self.get_groupbox_style())
+        adapters_group.setStyleSheet(_GROUPBOX_QSS)
         adapters_layout = QVBoxLayout(adapters_group)
         self.adapters_label = QLabel("Detecting adapters...")
-        self.adapters_label.setStyleSheet("color: #cccccc;")
+        self.adapters_label.setStyleSheet(_VALUE_LABEL_QSS)
         adapters_layout.addWidget(self.adapters_label)
         layout.addWidget(adapters_group)
         
         # Network stats grid
         network_group = QGroupBox("Network Statistics")
-        network_group.setStyleSheet(self.get_groupbox_style())
+        network_group.setStyleSheet(_GROUPBOX_QSS)
         network_layout = QGridLayout(network_group)
         
         # Upload speed
         network_layout.addWidget(QLabel("Upload Speed:"), 0, 0)
         self.upload_label = QLabel("0.00 Mbps")
-        self.upload_label.setStyleSheet("color: #4ec9b0; font-size: 14px; font-weight: bold;")
+        self.upload_label.setStyleSheet(_ACCENT_LABEL_QSS)
         network_layout.addWidget(self.upload_label, 0, 1)
         
         # Download speed
         network_layout.addWidget(QLabel("Download Speed:"), 0, 2)
         self.download_label = QLabel("0.00 Mbps")
-        self.download_label.setStyleSheet("color: #4ec9b0; font-size: 14px; font-weight: bold;")
+        self.download_label.setStyleSheet(_ACCENT_LABEL_QSS)
         network_layout.addWidget(self.download_label, 0, 3)
         
         # Ping
         network_layout.addWidget(QLabel("Ping Latency:"), 1, 0)
-        self.ping_label = QLabel("0 ms")
-        self.ping_label.setStyleSheet("color: #cccccc;")
+        self.ping_label = QLabel("—")
+        self.ping_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.ping_label, 1, 1)
         
         # Data sent
         network_layout.addWidget(QLabel("Data Sent:"), 1, 2)
         self.sent_label = QLabel("0 B")
-        self.sent_label.setStyleSheet("color: #cccccc;")
+        self.sent_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.sent_label, 1, 3)
         
         # Data received
         network_layout.addWidget(QLabel("Data Received:"), 2, 0)
         self.received_label = QLabel("0 B")
-        self.received_label.setStyleSheet("color: #cccccc;")
+        self.received_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.received_label, 2, 1)
         
         # Total data usage (since app start)
         network_layout.addWidget(QLabel("Total Usage (Session):"), 2, 2)
         self.total_usage_label = QLabel("0 B")
-        self.total_usage_label.setStyleSheet("color: #cccccc;")
+        self.total_usage_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.total_usage_label, 2, 3)
         
         # Public IP info
         network_layout.addWidget(QLabel("Public IP:"), 3, 0)
         self.public_ip_label = QLabel("--")
-        self.public_ip_label.setStyleSheet("color: #cccccc;")
+        self.public_ip_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.public_ip_label, 3, 1)
         
         network_layout.addWidget(QLabel("ISP:"), 3, 2)
         self.isp_label = QLabel("--")
-        self.isp_label.setStyleSheet("color: #cccccc;")
+        self.isp_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.isp_label, 3, 3)
         
         network_layout.addWidget(QLabel("Location:"), 4, 0)
         self.location_label = QLabel("--")
-        self.location_label.setStyleSheet("color: #cccccc;")
+        self.location_label.setStyleSheet(_VALUE_LABEL_QSS)
         network_layout.addWidget(self.location_label, 4, 1)
         
         layout.addWidget(network_group)
         
         # System stats grid
         system_group = QGroupBox("System Statistics")
-        system_group.setStyleSheet(self.get_groupbox_style())
+        system_group.setStyleSheet(_GROUPBOX_QSS)
         system_layout = QGridLayout(system_group)
         
         # CPU usage with progress bar
         system_layout.addWidget(QLabel("CPU Usage:"), 0, 0)
         self.cpu_label = QLabel("0%")
-        self.cpu_label.setStyleSheet("color: #cccccc;")
+        self.cpu_label.setStyleSheet(_VALUE_LABEL_QSS)
         system_layout.addWidget(self.cpu_label, 0, 1)
         self.cpu_progress = QProgressBar()
-        self.cpu_progress.setStyleSheet(self.get_progressbar_style())
+        self.cpu_progress.setStyleSheet(_PROGRESS_QSS)
         system_layout.addWidget(self.cpu_progress, 0, 2, 1, 2)
         
         # RAM usage
         system_layout.addWidget(QLabel("RAM Usage:"), 1, 0)
         self.ram_label = QLabel("0%")
-        self.ram_label.setStyleSheet("color: #cccccc;")
+        self.ram_label.setStyleSheet(_VALUE_LABEL_QSS)
         system_layout.addWidget(self.ram_label, 1, 1)
         self.ram_progress = QProgressBar()
-        self.ram_progress.setStyleSheet(self.get_progressbar_style())
+        self.ram_progress.setStyleSheet(_PROGRESS_QSS)
         system_layout.addWidget(self.ram_progress, 1, 2, 1, 2)
         
         # Disk usage
         system_layout.addWidget(QLabel("Disk Usage:"), 2, 0)
         self.disk_label = QLabel("0%")
-        self.disk_label.setStyleSheet("color: #cccccc;")
+        self.disk_label.setStyleSheet(_VALUE_LABEL_QSS)
         system_layout.addWidget(self.disk_label, 2, 1)
         self.disk_progress = QProgressBar()
-        self.disk_progress.setStyleSheet(self.get_progressbar_style())
+        self.disk_progress.setStyleSheet(_PROGRESS_QSS)
         system_layout.addWidget(self.disk_progress, 2, 2, 1, 2)
         
         # System uptime
         system_layout.addWidget(QLabel("System Uptime:"), 3, 0)
         self.system_uptime_label = QLabel("--")
-        self.system_uptime_label.setStyleSheet("color: #cccccc;")
+        self.system_uptime_label.setStyleSheet(_VALUE_LABEL_QSS)
         system_layout.addWidget(self.system_uptime_label, 3, 1)
         
+        layout.addWidget(system_group)
+        
         layout.addStretch()
         
         return widget
@@ -329,10 +484,11 @@ class MainWindow(QMainWindow):
         
         # Network speed graph
         network_graph_group = QGroupBox("Network Speed")
-        network_graph_group.setStyleSheet(self.get_groupbox_style())
+        network_graph_group.setStyleSheet(_GROUPBOX_QSS)
         network_graph_layout = QVBoxLayout(network_graph_group)
         
-        self.network_figure = Figure(figsize=(10, 4), facecolor='#1e1e1e')
+        # tight_layout=True re-fits the layout on every full draw, e.g. after a resize
+        self.network_figure = Figure(figsize=(10, 4), facecolor='#1e1e1e', tight_layout=True)
         self.network_canvas = FigureCanvas(self.network_figure)
         self.network_ax = self.network_figure.add_subplot(111)
         self.network_ax.set_facecolor('#1e1e1e')
@@ -341,23 +497,30 @@ class MainWindow(QMainWindow):
         self.network_ax.spines['top'].set_color('#555')
         self.network_ax.spines['right'].set_color('#555')
         self.network_ax.spines['left'].set_color('#555')
-        self.network_ax.set_xlabel('Time', color='#cccccc')
+        self.network_ax.set_xlabel('Time (minutes)', color='#cccccc')
         self.network_ax.set_ylabel('Speed (Mbps)', color='#cccccc')
         self.network_ax.set_title('Upload/Download Speed', color='#ffffff', fontsize=12)
-        self.network_line_upload = self.network_ax.plot([], [], label='Upload', color='#4ec9b0')[0]
-        self.network_line_download = self.network_ax.plot([], [], label='Download', color='#569cd6')[0]
+        self.network_ax.set_xlim(0, self.time_window / 60)
+        self.network_ax.set_ylim(0, 1)
+        # Animated artists are left out of full draws and blitted over the
+        # cached static background instead (see _blit_graph)
+        self.network_line_upload = self.network_ax.plot(
+            [], [], label='Upload', color='#4ec9b0', linewidth=1.5, animated=True)[0]
+        self.network_line_download = self.network_ax.plot(
+            [], [], label='Download', color='#569cd6', linewidth=1.5, animated=True)[0]
         self.network_ax.legend(facecolor='#2d2d2d', edgecolor='#555', labelcolor='#cccccc')
-        self.network_figure.tight_layout()
+        self.network_ax.grid(True, alpha=0.3, color='#555')
+        self.network_artists = (self.network_line_upload, self.network_line_download)
         
         network_graph_layout.addWidget(self.network_canvas)
         layout.addWidget(network_graph_group)
         
         # CPU usage graph
         cpu_graph_group = QGroupBox("CPU Usage")
-        cpu_graph_group.setStyleSheet(self.get_groupbox_style())
+        cpu_graph_group.setStyleSheet(_GROUPBOX_QSS)
         cpu_graph_layout = QVBoxLayout(cpu_graph_group)
         
-        self.cpu_figure = Figure(figsize=(10, 4), facecolor='#1e1e1e')
+        self.cpu_figure = Figure(figsize=(10, 4), facecolor='#1e1e1e', tight_layout=True)
         self.cpu_canvas = FigureCanvas(self.cpu_figure)
         self.cpu_ax = self.cpu_figure.add_subplot(111)
         self.cpu_ax.set_facecolor('#1e1e1e')
@@ -366,18 +529,51 @@ class MainWindow(QMainWindow):
         self.cpu_ax.spines['top'].set_color('#555')
         self.cpu_ax.spines['right'].set_color('#555')
         self.cpu_ax.spines['left'].set_color('#555')
-        self.cpu_ax.set_xlabel('Time', color='#cccccc')
+        self.cpu_ax.set_xlabel('Time (minutes)', color='#cccccc')
         self.cpu_ax.set_ylabel('CPU Usage (%)', color='#cccccc')
         self.cpu_ax.set_title('CPU Usage Over Time', color='#ffffff', fontsize=12)
+        self.cpu_ax.set_xlim(0, self.time_window / 60)
         self.cpu_ax.set_ylim(0, 100)
-        self.cpu_line = self.cpu_ax.plot([], [], color='#f48771')[0]
-        self.cpu_figure.tight_layout()
+        self.cpu_line = self.cpu_ax.plot([], [], color='#f48771', linewidth=1.5, animated=True)[0]
+        # Persistent fill under the line; its polygon is replaced each tick
+        self.cpu_fill = PolyCollection([], facecolor='#f48771', alpha=0.3, animated=True)
+        self.cpu_ax.add_collection(self.cpu_fill, autolim=False)
+        self.cpu_ax.grid(True, alpha=0.3, color='#555')
+        self.cpu_artists = (self.cpu_fill, self.cpu_line)
         
         cpu_graph_layout.addWidget(self.cpu_canvas)
         layout.addWidget(cpu_graph_group)
         
+        # Every full draw (first show, resize, axis change) re-captures the
+        # background that later ticks blit over
+        self._graph_backgrounds = {}
+        self.network_canvas.mpl_connect(
+            'draw_event',
+            lambda event: self._capture_graph_background(self.network_canvas, self.network_ax, self.network_artists))
+        self.cpu_canvas.mpl_connect(
+            'draw_event',
+            lambda event: self._capture_graph_background(self.cpu_canvas, self.cpu_ax, self.cpu_artists))
+        
         return widget
     
+    def _capture_graph_background(self, canvas, ax, artists):
+        """Cache the static axes image after a full draw, then paint the animated artists on it."""
+        self._graph_backgrounds[canvas] = canvas.copy_from_bbox(ax.bbox)
+        for artist in artists:
+            ax.draw_artist(artist)
+    
+    def _blit_graph(self, canvas, ax, artists):
+        """Redraw only the animated artists over the cached background."""
+        background = self._graph_backgrounds.get(canvas)
+        if background is None:
+            # Nothing cached yet; the full draw captures it for next time
+            canvas.draw_idle()
+            return
+        canvas.restore_region(background)
+        for artist in artists:
+            ax.draw_artist(artist)
+        canvas.blit(ax.bbox)
+    
     def create_logs_tab(self) -> QWidget:
         """Create logs and export tab."""
         widget = QWidget()
@@ -386,33 +582,33 @@ class MainWindow(QMainWindow):
         
         # Export section
         export_group = QGroupBox("Export Data")
-        export_group.setStyleSheet(self.get_groupbox_style())
+        export_group.setStyleSheet(_GROUPBOX_QSS)
         export_layout = QVBoxLayout(export_group)
         
         export_buttons_layout = QHBoxLayout()
         
         btn_export_network_csv = QPushButton("Export Network Stats (CSV)")
-        btn_export_network_csv.setStyleSheet(self.get_button_style())
+        btn_export_network_csv.setStyleSheet(_BUTTON_QSS)
         btn_export_network_csv.clicked.connect(lambda: self.exporter.export_csv("network_stats"))
         export_buttons_layout.addWidget(btn_export_network_csv)
         
         btn_export_system_csv = QPushButton("Export System Stats (CSV)")
-        btn_export_system_csv.setStyleSheet(self.get_button_style())
+        btn_export_system_csv.setStyleSheet(_BUTTON_QSS)
         btn_export_system_csv.clicked.connect(lambda: self.exporter.export_csv("system_stats"))
         export_buttons_layout.addWidget(btn_export_system_csv)
         
         btn_export_network_json = QPushButton("Export Network Stats (JSON)")
-        btn_export_network_json.setStyleSheet(self.get_button_style())
+        btn_export_network_json.setStyleSheet(_BUTTON_QSS)
         btn_export_network_json.clicked.connect(lambda: self.exporter.export_json("network_stats"))
         export_buttons_layout.addWidget(btn_export_network_json)
         
         btn_export_system_json = QPushButton("Export System Stats (JSON)")
-        btn_export_system_json.setStyleSheet(self.get_button_style())
+        btn_export_system_json.setStyleSheet(_BUTTON_QSS)
         btn_export_system_json.clicked.connect(lambda: self.exporter.export_json("system_stats"))
         export_buttons_layout.addWidget(btn_export_system_json)
         
         btn_export_all = QPushButton("Export All Data")
-        btn_export_all.setStyleSheet(self.get_button_style())
+        btn_export_all.setStyleSheet(_BUTTON_QSS)
         btn_export_all.clicked.connect(self.exporter.export_all_tables)
         export_buttons_layout.addWidget(btn_export_all)
         
@@ -421,7 +617,7 @@ class MainWindow(QMainWindow):
         
         # Logs section
         logs_group = QGroupBox("System Logs")
-        logs_group.setStyleSheet(self.get_groupbox_style())
+        logs_group.setStyleSheet(_GROUPBOX_QSS)
         logs_layout = QVBoxLayout(logs_group)
         
         self.log_display = QTextEdit()
@@ -438,7 +634,7 @@ class MainWindow(QMainWindow):
         logs_layout.addWidget(self.log_display)
         
         btn_clear_logs = QPushButton("Clear Logs")
-        btn_clear_logs.setStyleSheet(self.get_button_style())
+        btn_clear_logs.setStyleSheet(_BUTTON_QSS)
         btn_clear_logs.clicked.connect(self.clear_logs)
         logs_layout.addWidget(btn_clear_logs)
         
@@ -446,11 +642,22 @@ class MainWindow(QMainWindow):
         
         return widget
     
+    def setup_stats_worker(self):
+        """Move stats collection onto its own thread; the UI only applies results."""
+        self.stats_thread = QThread(self)
+        self.stats_worker = StatsWorker(self.network_monitor, self.system_monitor)
+        self.stats_worker.moveToThread(self.stats_thread)
+        self.stats_worker.stats_ready.connect(self.update_all_stats)
+        self.stats_thread.finished.connect(self.stats_worker.deleteLater)
+        self.stats_thread.start()
+    
     def setup_timers(self):
         """Setup update timers."""
         # Main stats update timer
         self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_all_stats)
+        # Precise timing keeps the sampling period steady for rate calculations
+        self.update_timer.setTimerType(Qt.PreciseTimer)
+        self.update_timer.timeout.connect(self.stats_worker.fetch, Qt.QueuedConnection)
         self.update_timer.start(self.refresh_rate)
         
         # Speed test timer (every 5 minutes)
@@ -458,16 +665,17 @@ class MainWindow(QMainWindow):
         self.speed_test_timer.timeout.connect(self.run_speed_test)
         self.speed_test_timer.start(300000)  # 5 minutes
         
+        # Public IP info timer (every 5 minutes); the lookup itself runs on
+        # the network monitor's pool and is skipped while its cache is fresh
+        self.geo_timer = QTimer()
+        self.geo_timer.timeout.connect(self.network_monitor.refresh_public_info)
+        self.geo_timer.start(300000)  # 5 minutes
+        
         # DateTime update timer
         self.datetime_timer = QTimer()
         self.datetime_timer.timeout.connect(self.update_datetime)
         self.datetime_timer.start(1000)  # Every second
         self.update_datetime()
-        
-        # Graph update timer
-        self.graph_timer = QTimer()
-        self.graph_timer.timeout.connect(self.update_graphs)
-        self.graph_timer.start(1000)  # Every second
     
     def setup_system_tray(self):
         """Setup system tray icon."""
@@ -524,203 +732,151 @@ class MainWindow(QMainWindow):
         # Set matplotlib style
         plt.style.use('dark_background')
     
-    def get_groupbox_style(self) -> str:
-        """Get style for group boxes."""
-        return """
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #555;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-                color: #ffffff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """
+    def format_bytes(self, bytes_value: float) -> str:
+        """Format bytes to human-readable format."""
+        # Each unit is 10 more bits, so the bit length picks it without a loop
+        exponent = min(max(int(bytes_value).bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_value / (1 << (10 * exponent)):.2f} {_BYTE_UNITS[exponent]}"
     
-    def get_button_style(self) -> str:
-        """Get style for buttons."""
-        return """
-            QPushButton {
-                background: #0078d4;
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #106ebe;
-            }
-            QPushButton:pressed {
-                background: #005a9e;
-            }
-        """
+    def _set(self, label: QLabel, text: str):
+        """Set a label's text, skipping the relayout and repaint when it is unchanged."""
+        if self.label_cache.get(label) != text:
+            self.label_cache[label] = text
+            label.setText(text)
     
-    def get_progressbar_style(self) -> str:
-        """Get style for progress bars."""
-        return """
-            QProgressBar {
-                border: 1px solid #555;
-                border-radius: 3px;
-                text-align: center;
-                color: #ffffff;
-                background: #2d2d2d;
-            }
-            QProgressBar::chunk {
-                background: #0078d4;
-                border-radius: 2px;
-            }
-        """
+    def _set_progress(self, bar: QProgressBar, value: float):
+        """Set a progress bar to the whole percentage, skipping it when unchanged."""
+        value = int(value)
+        if self.progress_cache.get(bar) != value:
+            self.progress_cache[bar] = value
+            bar.setValue(value)
     
-    def format_bytes(self, bytes_value: float) -> str:
-        """Format bytes to human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.2f} PB"
-    
-    def update_all_stats(self):
-        """Update all statistics displays."""
+    def update_all_stats(self, network_stats: dict, system_stats: dict):
+        """Update all statistics displays from a worker fetch."""
         # Network stats
-        network_stats = self.network_monitor.get_network_stats()
-        self.upload_label.setText(f"{network_stats['upload_speed']:.2f} Mbps")
-        self.download_label.setText(f"{network_stats['download_speed']:.2f} Mbps")
-        self.ping_label.setText(f"{network_stats['ping_latency']:.1f} ms")
-        self.sent_label.setText(self.format_bytes(network_stats['bytes_sent']))
-        self.received_label.setText(self.format_bytes(network_stats['bytes_received']))
-        self.public_ip_label.setText(network_stats['public_ip'])
-        self.ip_label.setText(f"IP: {network_stats['public_ip']}")
-        self.isp_label.setText(network_stats['isp_name'])
-        self.location_label.setText(network_stats['location'])
+        self._set(self.upload_label, f"{network_stats['upload_speed']:.2f} Mbps")
+        self._set(self.download_label, f"{network_stats['download_speed']:.2f} Mbps")
+        ping = network_stats['ping_latency']
+        # NaN means the probe got no reply
+        self._set(self.ping_label, f"{ping:.1f} ms" if math.isfinite(ping) else "—")
+        self._set(self.sent_label, self.format_bytes(network_stats['bytes_sent']))
+        self._set(self.received_label, self.format_bytes(network_stats['bytes_received']))
+        
+        # Public IP info changes on the order of hours, so these rarely repaint
+        self._set(self.public_ip_label, network_stats['public_ip'])
+        self._set(self.ip_label, f"IP: {network_stats['public_ip']}")
+        self._set(self.isp_label, network_stats['isp_name'])
+        self._set(self.location_label, network_stats['location'])
         
         # Total data usage
-        total_sent, total_recv = self.network_monitor.get_total_data_usage()
-        total_usage = total_sent + total_recv
-        self.total_usage_label.setText(self.format_bytes(total_usage))
+        self._set(self.total_usage_label, self.format_bytes(network_stats['total_usage']))
         
         # System stats
-        system_stats = self.system_monitor.get_all_stats()
-        self.cpu_label.setText(f"{system_stats['cpu_usage']:.1f}%")
-        self.cpu_progress.setValue(int(system_stats['cpu_usage']))
-        self.ram_label.setText(f"{system_stats['ram_usage']:.1f}%")
-        self.ram_progress.setValue(int(system_stats['ram_usage']))
-        self.disk_label.setText(f"{system_stats['disk_usage']:.1f}%")
-        self.disk_progress.setValue(int(system_stats['disk_usage']))
-        self.system_uptime_label.setText(
-            self.system_monitor.format_uptime(system_stats['uptime'])
-        )
+        self._set(self.cpu_label, f"{system_stats['cpu_usage']:.1f}%")
+        self._set_progress(self.cpu_progress, system_stats['cpu_usage'])
+        self._set(self.ram_label, f"{system_stats['ram_usage']:.1f}%")
+        self._set_progress(self.ram_progress, system_stats['ram_usage'])
+        self._set(self.disk_label, f"{system_stats['disk_usage']:.1f}%")
+        self._set_progress(self.disk_progress, system_stats['disk_usage'])
+        self._set(self.system_uptime_label, self.system_monitor.format_uptime(system_stats['uptime']))
         
         # App uptime
         app_uptime = (datetime.now() - self.app_start_time).total_seconds()
-        self.uptime_label.setText(
-            f"Uptime: {self.system_monitor.format_uptime(app_uptime)}"
-        )
+        self._set(self.uptime_label, f"Uptime: {self.system_monitor.format_uptime(app_uptime)}")
         
         # Update adapters
-        adapters = self.network_monitor.get_active_adapters()
+        adapters = network_stats['adapters']
         adapter_text = "\n".join([
             f"• {adapter['name']} - {adapter['ip']} ({adapter['speed']})"
             for adapter in adapters
         ]) if adapters else "No active adapters found"
-        self.adapters_label.setText(adapter_text)
+        self._set(self.adapters_label, adapter_text)
+        
+        # Graph history keeps growing while the graphs are hidden
+        current_time = datetime.now().timestamp()
+        self.network_data.append(
+            current_time,
+            upload=network_stats['upload_speed'],
+            download=network_stats['download_speed']
+        )
+        self.system_data.append(current_time, cpu=system_stats['cpu_usage'])
+        # Same tick as the labels, so no separate graph timer is needed
+        self.render_graphs_if_visible()
         
         # Log to database
         self.data_manager.log_network_stats(network_stats)
         self.data_manager.log_system_stats(system_stats)
     
-    def update_graphs(self):
-        """Update graph displays."""
-        current_time = datetime.now().timestamp()
-        
-        # Get network stats
-        network_stats = self.network_monitor.get_network_stats()
-        
-        # Add to network data
-        self.network_data['time'].append(current_time)
-        self.network_data['upload'].append(network_stats['upload_speed'])
-        self.network_data['download'].append(network_stats['download_speed'])
-        
-        # Get system stats
-        system_stats = self.system_monitor.get_all_stats()
-        self.system_data['time'].append(current_time)
-        self.system_data['cpu'].append(system_stats['cpu_usage'])
-        
+    def graphs_visible(self) -> bool:
+        """Whether the graphs tab is on screen."""
+        return (self.isVisible() and not self.isMinimized()
+                and self.tab_widget.currentWidget() is self.graphs_tab_widget)
+    
+    def render_graphs_if_visible(self):
+        """Redraw the graphs only if they are on screen."""
+        if self.graphs_visible():
+            self.render_graphs()
+    
+    def on_tab_changed(self, index: int):
+        """Bring the graphs up to date when their tab is shown."""
+        self.render_graphs_if_visible()
+    
+    def render_graphs(self):
+        """Draw the samples inside the current time window."""
         # Filter data based on time window
-        cutoff_time = current_time - self.time_window
+        cutoff_time = datetime.now().timestamp() - self.time_window
         
         # Network graph
-        network_times = [t for t in self.network_data['time'] if t >= cutoff_time]
-        network_upload = self.network_data['upload'][-len(network_times):]
-        network_download = self.network_data['download'][-len(network_times):]
+        network_times, network_values = self.network_data.since(cutoff_time)
+        network_upload = network_values['upload']
+        network_download = network_values['download']
         
-        if network_times:
+        # Axis limits only change with the time window or a new speed range;
+        # anything else is a cheap blit of the line artists
+        window_minutes = self.time_window / 60
+        
+        if len(network_times):
             # Convert to relative time
-            relative_times = [(t - network_times[0]) / 60 for t in network_times]  # Minutes
-            
-            self.network_ax.clear()
-            self.network_ax.set_facecolor('#1e1e1e')
-            self.network_ax.tick_params(colors='#cccccc')
-            self.network_ax.spines['bottom'].set_color('#555')
-            self.network_ax.spines['top'].set_color('#555')
-            self.network_ax.spines['right'].set_color('#555')
-            self.network_ax.spines['left'].set_color('#555')
-            self.network_ax.set_xlabel('Time (minutes)', color='#cccccc')
-            self.network_ax.set_ylabel('Speed (Mbps)', color='#cccccc')
-            self.network_ax.set_title('Upload/Download Speed', color='#ffffff', fontsize=12)
+            relative_times = (network_times - network_times[0]) / 60  # Minutes
+            # No more points than the canvas has pixels to show
+            relative_times, (network_upload, network_download) = _decimate(
+                relative_times, (network_upload, network_download),
+                self.network_canvas.get_width_height()[0])
+            self.network_line_upload.set_data(relative_times, network_upload)
+            self.network_line_download.set_data(relative_times, network_download)
             
-            self.network_ax.plot(relative_times, network_upload, label='Upload', color='#4ec9b0', linewidth=1.5)
-            self.network_ax.plot(relative_times, network_download, label='Download', color='#569cd6', linewidth=1.5)
-            self.network_ax.legend(facecolor='#2d2d2d', edgecolor='#555', labelcolor='#cccccc')
-            self.network_ax.grid(True, alpha=0.3, color='#555')
-            self.network_figure.tight_layout()
-            self.network_canvas.draw()
+            # Rescale when the peak leaves the axis or shrinks well below it
+            peak = float(max(network_upload.max(), network_download.max()))
+            y_top = self.network_ax.get_ylim()[1]
+            rescale = peak > y_top or (y_top > 1 and peak < y_top / 4)
+            if rescale or self.network_ax.get_xlim()[1] != window_minutes:
+                self.network_ax.set_xlim(0, window_minutes)
+                self.network_ax.set_ylim(0, max(peak * 1.2, 1))
+                # Coalesced with any other pending draw on the next event loop pass
+                self.network_canvas.draw_idle()
+            else:
+                self._blit_graph(self.network_canvas, self.network_ax, self.network_artists)
         
         # CPU graph
-        cpu_times = [t for t in self.system_data['time'] if t >= cutoff_time]
-        cpu_values = self.system_data['cpu'][-len(cpu_times):]
-        
-        if cpu_times:
-            relative_times = [(t - cpu_times[0]) / 60 for t in cpu_times]  # Minutes
-            
-            self.cpu_ax.clear()
-            self.cpu_ax.set_facecolor('#1e1e1e')
-            self.cpu_ax.tick_params(colors='#cccccc')
-            self.cpu_ax.spines['bottom'].set_color('#555')
-            self.cpu_ax.spines['top'].set_color('#555')
-            self.cpu_ax.spines['right'].set_color('#555')
-            self.cpu_ax.spines['left'].set_color('#555')
-            self.cpu_ax.set_xlabel('Time (minutes)', color='#cccccc')
-            self.cpu_ax.set_ylabel('CPU Usage (%)', color='#cccccc')
-            self.cpu_ax.set_title('CPU Usage Over Time', color='#ffffff', fontsize=12)
-            self.cpu_ax.set_ylim(0, 100)
+        cpu_times, cpu_columns = self.system_data.since(cutoff_time)
+        cpu_values = cpu_columns['cpu']
+        
+        if len(cpu_times):
+            relative_times = (cpu_times - cpu_times[0]) / 60  # Minutes
+            relative_times, (cpu_values,) = _decimate(
+                relative_times, (cpu_values,), self.cpu_canvas.get_width_height()[0])
+            self.cpu_line.set_data(relative_times, cpu_values)
+            # Close the fill polygon down to the x axis at both ends
+            self.cpu_fill.set_verts([np.column_stack((
+                np.concatenate(([relative_times[0]], relative_times, [relative_times[-1]])),
+                np.concatenate(([0], cpu_values, [0]))
+            ))])
             
-            self.cpu_ax.plot(relative_times, cpu_values, color='#f48771', linewidth=1.5)
-            self.cpu_ax.fill_between(relative_times, cpu_values, alpha=0.3, color='#f48771')
-            self.cpu_ax.grid(True, alpha=0.3, color='#555')
-            self.cpu_figure.tight_layout()
-            self.cpu_canvas.draw()
-        
-        # Limit data size
-        if len(self.network_data['time']) > 10000:
-            keep = len(network_times) if network_times else 1000
-            self.network_data = {
-                'time': self.network_data['time'][-keep:],
-                'upload': self.network_data['upload'][-keep:],
-                'download': self.network_data['download'][-keep:]
-            }
-        
-        if len(self.system_data['time']) > 10000:
-            keep = len(cpu_times) if cpu_times else 1000
-            self.system_data = {
-                'time': self.system_data['time'][-keep:],
-                'cpu': self.system_data['cpu'][-keep:]
-            }
+            if self.cpu_ax.get_xlim()[1] != window_minutes:
+                self.cpu_ax.set_xlim(0, window_minutes)
+                self.cpu_canvas.draw_idle()
+            else:
+                self._blit_graph(self.cpu_canvas, self.cpu_ax, self.cpu_artists)
     
     def update_datetime(self):
         """Update date/time display."""
@@ -741,18 +897,22 @@ class MainWindow(QMainWindow):
         self.logger.info(f"Time window changed to {self.window_combo.currentText()}")
     
     def run_speed_test(self):
-        """Run speed test in background thread."""
-        if self.speed_test_thread and self.speed_test_thread.isRunning():
+        """Run speed test on the thread pool."""
+        if self.speed_test_running:
             return
         
         self.logger.info("Starting speed test...")
-        self.speed_test_thread = SpeedTestThread(self.network_monitor)
-        self.speed_test_thread.finished.connect(self.on_speed_test_finished)
-        self.speed_test_thread.error.connect(self.on_speed_test_error)
-        self.speed_test_thread.start()
+        self.speed_test_running = True
+        runnable = SpeedTestRunnable(self.network_monitor)
+        runnable.signals.finished.connect(self.on_speed_test_finished)
+        runnable.signals.error.connect(self.on_speed_test_error)
+        self.speed_test_signals = runnable.signals
+        self.thread_pool.start(runnable)
     
     def on_speed_test_finished(self, result: dict):
         """Handle speed test completion."""
+        self.speed_test_running = False
+        self.speed_test_signals = None
         self.logger.info(
             f"Speed test completed: {result['download_mbps']:.2f} Mbps down, "
             f"{result['upload_mbps']:.2f} Mbps up, {result['ping_ms']:.2f} ms ping"
@@ -766,6 +926,8 @@ class MainWindow(QMainWindow):
     
     def on_speed_test_error(self, error: str):
         """Handle speed test error."""
+        self.speed_test_running = False
+        self.speed_test_signals = None
         self.logger.warning(f"Speed test failed: {error}")
     
     def update_log_display(self, timestamp: str, message: str):
@@ -790,6 +952,17 @@ class MainWindow(QMainWindow):
             self.logger.error(message)
             QMessageBox.warning(self, "Export Failed", message)
     
+    def showEvent(self, event):
+        """Bring the graphs up to date when the window is shown."""
+        super().showEvent(event)
+        self.render_graphs_if_visible()
+    
+    def changeEvent(self, event):
+        """Bring the graphs up to date when the window is restored."""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.render_graphs_if_visible()
+    
     def closeEvent(self, event):
         """Handle window close event."""
         if hasattr(self, 'tray_icon') and self.tray_icon.isVisible():
@@ -803,4 +976,27 @@ class MainWindow(QMainWindow):
             event.ignore()
         else:
             self.logger.info("NetScope shutting down")
+            for timer in (self.update_timer, self.speed_test_timer,
+                          self.geo_timer, self.datetime_timer):
+                timer.stop()
+            # A speed test in flight would otherwise log into the closed
+            # database when it finishes; it cannot be interrupted, so only
+            # wait briefly for it
+            if self.speed_test_signals is not None:
+                self.speed_test_signals.finished.disconnect()
+                self.speed_test_signals.error.disconnect()
+            self.thread_pool.clear()
+            if not self.thread_pool.waitForDone(2000):
+                # Hand the pool to C++ so its destructor, which waits for
+                # every job, never runs; process exit ends the thread
+                sip.transferto(self.thread_pool, None)
+            # A fetch finishing now would queue stats that log after close
+            self.stats_worker.stats_ready.disconnect(self.update_all_stats)
+            self.stats_thread.quit()
+            self.stats_thread.wait()
+            self.network_monitor.stop()
+            # Let a running export finish writing its file before the
+            # database it reads from goes away
+            self.exporter.wait_for_exports()
+            self.data_manager.close()
             event.accept()
@@ -4,7 +4,24 @@ Exporter - Handles data export to CSV and JSON formats.
 import os
 from typing import Optional
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class ExportRunnable(QRunnable):
+    """Export job run on the exporter's pool so the UI never waits on disk."""
+    
+    def __init__(self, exporter, work):
+        super().__init__()
+        self.exporter = exporter
+        self.work = work  # callable returning (success, message)
+    
+    def run(self):
+        try:
+            success, message = self.work()
+        except Exception as e:
+            success, message = False, f"Export error: {str(e)}"
+        # Receivers live on the UI thread, so Qt queues this emit to it
+        self.exporter.export_complete.emit(success, message)
 
 
 class Exporter(QObject):
@@ -16,9 +33,22 @@ class Exporter(QObject):
         """Initialize exporter."""
         super().__init__(parent)
         self.data_manager = data_manager
+        # One export at a time, off the UI thread. The thread is kept rather
+        # than expired, so its database reader connection is reused.
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self.thread_pool.setExpiryTimeout(-1)
+    
+    def _start(self, work):
+        """Run an export job in the background."""
+        self.thread_pool.start(ExportRunnable(self, work))
+    
+    def wait_for_exports(self):
+        """Block until queued and running exports have finished."""
+        self.thread_pool.waitForDone()
     
     def export_csv(self, table: str = "network_stats", seconds: Optional[int] = None) -> bool:
-        """Export data to CSV file."""
+        """Export data to CSV file in the background. Returns True once started."""
         try:
             # Get save path
             file_path, _ = QFileDialog.getSaveFileName(
@@ -31,20 +61,19 @@ class Exporter(QObject):
             if not file_path:
                 return False
             
-            success = self.data_manager.export_to_csv(file_path, table, seconds)
+            def work():
+                if self.data_manager.export_to_csv(file_path, table, seconds):
+                    return True, f"Successfully exported to {file_path}"
+                return False, "Export failed"
             
-            if success:
-                self.export_complete.emit(True, f"Successfully exported to {file_path}")
-                return True
-            else:
-                self.export_complete.emit(False, "Export failed")
-                return False
+            self._start(work)
+            return True
         except Exception as e:
             self.export_complete.emit(False, f"Export error: {str(e)}")
             return False
     
     def export_json(self, table: str = "network_stats", seconds: Optional[int] = None) -> bool:
-        """Export data to JSON file."""
+        """Export data to JSON file in the background. Returns True once started."""
         try:
             # Get save path
             file_path, _ = QFileDialog.getSaveFileName(
@@ -57,20 +86,19 @@ class Exporter(QObject):
             if not file_path:
                 return False
             
-            success = self.data_manager.export_to_json(file_path, table, seconds)
+            def work():
+                if self.data_manager.export_to_json(file_path, table, seconds):
+                    return True, f"Successfully exported to {file_path}"
+                return False, "Export failed"
             
-            if success:
-                self.export_complete.emit(True, f"Successfully exported to {file_path}")
-                return True
-            else:
-                self.export_complete.emit(False, "Export failed")
-                return False
+            self._start(work)
+            return True
         except Exception as e:
             self.export_complete.emit(False, f"Export error: {str(e)}")
             return False
     
     def export_all_tables(self) -> bool:
-        """Export all tables to a directory."""
+        """Export all tables to a directory in the background. Returns True once started."""
         try:
             dir_path = QFileDialog.getExistingDirectory(
                 self.parent(),
@@ -80,27 +108,25 @@ class Exporter(QObject):
             if not dir_path:
                 return False
             
-            tables = ["network_stats", "system_stats", "speed_tests", "events"]
-            success_count = 0
-            
-            for table in tables:
-                csv_path = os.path.join(dir_path, f"{table}.csv")
-                json_path = os.path.join(dir_path, f"{table}.json")
+            def work():
+                tables = ["network_stats", "system_stats", "speed_tests", "events"]
+                success_count = 0
+                
+                for table in tables:
+                    csv_path = os.path.join(dir_path, f"{table}.csv")
+                    json_path = os.path.join(dir_path, f"{table}.json")
+                    
+                    if self.data_manager.export_to_csv(csv_path, table):
+                        success_count += 1
+                    if self.data_manager.export_to_json(json_path, table):
+                        success_count += 1
                 
-                if self.data_manager.export_to_csv(csv_path, table):
-                    success_count += 1
-                if self.data_manager.export_to_json(json_path, table):
-                    success_count += 1
+                if success_count > 0:
+                    return True, f"Exported {success_count} files to {dir_path}"
+                return False, "Export failed"
             
-            if success_count > 0:
-                self.export_complete.emit(
-                    True,
-                    f"Exported {success_count} files to {dir_path}"
-                )
-                return True
-            else:
-                self.export_complete.emit(False, "Export failed")
-                return False
+            self._start(work)
+            return True
         except Exception as e:
             self.export_complete.emit(False, f"Export error: {str(e)}")
             return False
@@ -0,0 +1,90 @@
+"""
+Export tests - CSV and JSON exports streamed straight from the cursor.
+"""
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from netscope.core.data_manager import DataManager, _json_dumps, _stdlib_json_dumps, orjson
+
+
+class StreamingExportTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dm = DataManager(os.path.join(self._tmp.name, 'network_logs.db'))
+    
+    def tearDown(self):
+        self.dm.close()
+        self._tmp.cleanup()
+    
+    def _path(self, name):
+        return os.path.join(self._tmp.name, name)
+    
+    def test_empty_table(self):
+        self.assertTrue(self.dm.export_to_csv(self._path('events.csv'), table='events'))
+        with open(self._path('events.csv'), newline='') as f:
+            self.assertEqual(list(csv.reader(f)), [['id', 'timestamp', 'event_type', 'message']])
+        
+        self.assertTrue(self.dm.export_to_json(self._path('events.json'), table='events'))
+        with open(self._path('events.json')) as f:
+            self.assertEqual(json.load(f), [])
+    
+    def test_rows_across_fetch_chunks(self):
+        # More rows than one fetchmany() chunk, so the JSON separators are
+        # written across a chunk boundary
+        count = 10005
+        for i in range(count):
+            self.dm.log_event('info', f'event {i}')
+        
+        self.assertTrue(self.dm.export_to_csv(self._path('events.csv'), table='events'))
+        with open(self._path('events.csv'), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), count)
+        self.assertEqual(rows[-1]['message'], f'event {count - 1}')
+        
+        self.assertTrue(self.dm.export_to_json(self._path('events.json'), table='events'))
+        with open(self._path('events.json')) as f:
+            rows = json.load(f)
+        self.assertEqual(len(rows), count)
+        self.assertEqual(rows[0]['message'], 'event 0')
+        self.assertEqual(rows[-1]['message'], f'event {count - 1}')
+    
+    def test_seconds_window(self):
+        with mock.patch('netscope.core.data_manager._now', return_value=1_000_000.0):
+            self.dm.log_event('info', 'old')
+            self.dm.flush()
+        self.dm.log_event('info', 'new')
+        
+        self.assertTrue(self.dm.export_to_json(self._path('events.json'), table='events', seconds=3600))
+        with open(self._path('events.json')) as f:
+            self.assertEqual([row['message'] for row in json.load(f)], ['new'])
+    
+    def test_unknown_table(self):
+        self.assertFalse(self.dm.export_to_csv(self._path('x.csv'), table='sqlite_master'))
+
+
+
+class JsonEncoderTest(unittest.TestCase):
+    """Export rows encode the same with or without orjson installed."""
+    
+    ROW = {'id': 1, 'ping_latency': float('nan'), 'upload_speed': float('inf'),
+           'download_speed': 1.5, 'isp_name': 'Café', 'location': None}
+    
+    def test_stdlib_fallback(self):
+        self.assertEqual(
+            _stdlib_json_dumps(self.ROW),
+            '{"id":1,"ping_latency":null,"upload_speed":null,"download_speed":1.5,'
+            '"isp_name":"Café","location":null}'.encode('utf-8')
+        )
+    
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_matches_orjson(self):
+        self.assertEqual(_json_dumps(self.ROW), _stdlib_json_dumps(self.ROW))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Migration tests - open a database in the original (version 0) schema with DataManager.
+"""
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from netscope.core.data_manager import DataManager, _SCHEMA_VERSION
+
+
+# The schema NetScope shipped with: AUTOINCREMENT ids, float samples, no user_version
+_BASELINE_SCHEMA = '''
+    CREATE TABLE network_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        adapter_name TEXT,
+        upload_speed REAL,
+        download_speed REAL,
+        ping_latency REAL,
+        bytes_sent REAL,
+        bytes_received REAL,
+        public_ip TEXT,
+        isp_name TEXT,
+        location TEXT
+    );
+    CREATE TABLE system_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        cpu_usage REAL,
+        ram_usage REAL,
+        disk_usage REAL,
+        uptime REAL
+    );
+    CREATE TABLE speed_tests (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        download_mbps REAL,
+        upload_mbps REAL,
+        ping_ms REAL,
+        server_name TEXT
+    );
+    CREATE TABLE events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        event_type TEXT,
+        message TEXT
+    );
+'''
+
+
+class BaselineMigrationTest(unittest.TestCase):
+    """A version 0 database survives the fixed-point and table rebuild migrations."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp.name, 'network_logs.db')
+        self.ts = round(time.time() - 60, 3)
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_BASELINE_SCHEMA)
+        conn.execute(
+            'INSERT INTO network_stats (timestamp, adapter_name, upload_speed, download_speed, '
+            'ping_latency, bytes_sent, bytes_received, public_ip, isp_name, location) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (self.ts, 'eth0', 1.5, 12.25, 23.45, 1024.0, 4096.0, '203.0.113.7', 'Example ISP', 'Nowhere')
+        )
+        conn.execute(
+            'INSERT INTO system_stats (timestamp, cpu_usage, ram_usage, disk_usage, uptime) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.ts, 12.34, 56.78, 90.12, 3600.0)
+        )
+        conn.execute(
+            'INSERT INTO speed_tests (timestamp, download_mbps, upload_mbps, ping_ms, server_name) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.ts, 95.5, 20.25, 14.5, 'Test Server')
+        )
+        conn.execute(
+            'INSERT INTO events (timestamp, event_type, message) VALUES (?, ?, ?)',
+            (self.ts, 'info', 'baseline event')
+        )
+        conn.commit()
+        conn.close()
+        
+        self.dm = DataManager(self.db_path)
+    
+    def tearDown(self):
+        self.dm.close()
+        self._tmp.cleanup()
+    
+    def test_schema_upgraded(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], _SCHEMA_VERSION)
+            # Switched over by the one-time VACUUM, so retention can free pages
+            self.assertEqual(conn.execute('PRAGMA auto_vacuum').fetchone()[0], 2)
+            for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table'"):
+                self.assertNotIn('AUTOINCREMENT', sql.upper())
+        finally:
+            conn.close()
+    
+    def test_backup_taken(self):
+        backup_path = self.db_path + '.v0.bak'
+        self.assertTrue(os.path.exists(backup_path))
+        
+        conn = sqlite3.connect(backup_path)
+        try:
+            self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], 0)
+            row = conn.execute('SELECT timestamp, cpu_usage FROM system_stats').fetchone()
+            self.assertEqual(row, (self.ts, 12.34))
+        finally:
+            conn.close()
+    
+    def test_history_round_trip(self):
+        network = self.dm.get_network_history(3600)
+        self.assertEqual(len(network['timestamp']), 1)
+        self.assertAlmostEqual(network['timestamp'][0], self.ts, places=3)
+        self.assertEqual(network['adapter_name'][0], 'eth0')
+        self.assertAlmostEqual(network['upload_speed'][0], 1.5)
+        self.assertAlmostEqual(network['download_speed'][0], 12.25)
+        self.assertAlmostEqual(network['ping_latency'][0], 23.45)
+        
+        system = self.dm.get_system_history(3600)
+        self.assertEqual(len(system['timestamp']), 1)
+        self.assertAlmostEqual(system['cpu_usage'][0], 12.34)
+        self.assertAlmostEqual(system['ram_usage'][0], 56.78)
+        self.assertAlmostEqual(system['disk_usage'][0], 90.12)
+        
+        # The rollups are rebuilt from the migrated samples
+        rollup = self.dm.get_system_history(3600, max_points=10)
+        self.assertAlmostEqual(rollup['cpu_usage'][0], 12.34)
+    
+    def test_exports(self):
+        csv_path = os.path.join(self._tmp.name, 'speed_tests.csv')
+        self.assertTrue(self.dm.export_to_csv(csv_path, table='speed_tests'))
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertAlmostEqual(float(rows[0]['download_mbps']), 95.5)
+        self.assertAlmostEqual(float(rows[0]['ping_ms']), 14.5)
+        self.assertEqual(rows[0]['server_name'], 'Test Server')
+        
+        json_path = os.path.join(self._tmp.name, 'system_stats.json')
+        self.assertTrue(self.dm.export_to_json(json_path, table='system_stats'))
+        with open(json_path) as f:
+            rows = json.load(f)
+        self.assertEqual(len(rows), 1)
+        self.assertAlmostEqual(rows[0]['timestamp'], self.ts, places=3)
+        self.assertAlmostEqual(rows[0]['cpu_usage'], 12.34)
+        self.assertAlmostEqual(rows[0]['uptime'], 3600.0)
+    
+    def test_new_rows_after_migration(self):
+        self.dm.log_event('info', 'after migration')
+        events = self.dm.get_recent_events()
+        self.assertEqual([e['message'] for e in events], ['baseline event', 'after migration'])
+
+
+
+class ReplacedDatabaseTest(unittest.TestCase):
+    """A database file removed while the process runs is set up again on reopen."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_path = os.path.join(self._tmp.name, 'network_logs.db')
+    
+    def test_reopen_after_delete(self):
+        DataManager(self.db_path).close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+        
+        dm = DataManager(self.db_path)
+        try:
+            dm.log_event('info', 'fresh file')
+            self.assertEqual([e['message'] for e in dm.get_recent_events()], ['fresh file'])
+        finally:
+            dm.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
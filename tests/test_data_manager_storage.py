@@ -0,0 +1,102 @@
+"""
+Storage tests - fixed-point conversion of samples on the write path.
+"""
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from netscope.core.data_manager import DataManager, _to_fixed, _PERCENT_SCALE, _PING_SCALE
+
+
+class ToFixedTest(unittest.TestCase):
+    
+    def test_scales_and_rounds(self):
+        self.assertEqual(_to_fixed(12.346, _PERCENT_SCALE), 1235)
+        self.assertEqual(_to_fixed(0.004, _PING_SCALE), 0)
+        self.assertEqual(_to_fixed(-1.5, 1), -2)
+    
+    def test_missing_and_non_finite_are_none(self):
+        self.assertIsNone(_to_fixed(None, _PERCENT_SCALE))
+        self.assertIsNone(_to_fixed(float('nan'), _PERCENT_SCALE))
+        self.assertIsNone(_to_fixed(float('inf'), _PING_SCALE))
+        self.assertIsNone(_to_fixed(float('-inf'), 1))
+
+
+class NonFiniteSampleTest(unittest.TestCase):
+    """A NaN sample is stored as NULL and read back as NaN instead of raising."""
+    
+    def setUp(self):
+        self.dm = DataManager(':memory:')
+    
+    def tearDown(self):
+        self.dm.close()
+    
+    def test_nan_round_trip(self):
+        self.dm.log_system_stats({'cpu_usage': float('nan'), 'ram_usage': 50.0,
+                                  'disk_usage': float('inf'), 'uptime': 10})
+        system = self.dm.get_system_history(60)
+        self.assertEqual(len(system['timestamp']), 1)
+        self.assertTrue(math.isnan(system['cpu_usage'][0]))
+        self.assertAlmostEqual(system['ram_usage'][0], 50.0)
+        self.assertTrue(math.isnan(system['disk_usage'][0]))
+
+
+
+class RollupTest(unittest.TestCase):
+    """The per-minute rollup keeps a running average per metric."""
+    
+    def setUp(self):
+        self.dm = DataManager(':memory:')
+        # Pin the clock inside one minute bucket
+        self.now = (1_700_000_000 // 60) * 60 + 30.0
+        patcher = mock.patch('netscope.core.data_manager._now', return_value=self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        self.dm.close()
+    
+    def test_null_sample_does_not_poison_average(self):
+        for cpu in (10.0, None, 30.0):
+            self.dm.log_system_stats({'cpu_usage': cpu, 'ram_usage': 40.0,
+                                      'disk_usage': 50.0, 'uptime': 100})
+        rollup = self.dm.get_system_history(3600, max_points=10)
+        self.assertEqual(len(rollup['timestamp']), 1)
+        self.assertAlmostEqual(rollup['cpu_usage'][0], 20.0)
+        self.assertAlmostEqual(rollup['ram_usage'][0], 40.0)
+
+
+
+class RetentionTest(unittest.TestCase):
+    """Rows older than the retention window are deleted and their pages reclaimed."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dm = DataManager(os.path.join(self._tmp.name, 'network_logs.db'), retention_days=1)
+        self.addCleanup(self.dm.close)
+    
+    def test_old_rows_removed(self):
+        old = self.dm._last_retention - 2 * 86400
+        with mock.patch('netscope.core.data_manager._now', return_value=old):
+            for i in range(2000):
+                self.dm.log_event('info', f'old event {i} ' + 'x' * 200)
+                self.dm.log_system_stats({'cpu_usage': 1.0, 'ram_usage': 2.0,
+                                          'disk_usage': 3.0, 'uptime': i})
+            self.dm.flush()
+        self.dm.log_event('info', 'new event')
+        self.dm.flush()
+        
+        page_count = self.dm.conn.execute('PRAGMA page_count').fetchone()[0]
+        self.dm._apply_retention()
+        
+        self.assertEqual([e['message'] for e in self.dm.get_recent_events()], ['new event'])
+        self.assertEqual(len(self.dm.get_system_history(7 * 86400)['timestamp']), 0)
+        self.assertEqual(len(self.dm.get_system_history(7 * 86400, max_points=10)['timestamp']), 0)
+        self.assertLess(self.dm.conn.execute('PRAGMA page_count').fetchone()[0], page_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
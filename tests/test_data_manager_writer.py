@@ -0,0 +1,93 @@
+"""
+Writer tests - batching, flush and shutdown of the background writer thread.
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from netscope.core.data_manager import DataManager, _STOP
+
+
+class WriterTestCase(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_path = os.path.join(self._tmp.name, 'network_logs.db')
+        self.dm = DataManager(self.db_path, flush_every=5)
+        self.addCleanup(self.dm.close)
+        # Only a full batch or an explicit flush commits
+        self.dm._flush_interval = 3600.0
+    
+    def committed_events(self) -> int:
+        """Count events visible to another connection."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+        finally:
+            conn.close()
+    
+    def wait_for_events(self, count: int, timeout: float = 2.0) -> int:
+        deadline = time.monotonic() + timeout
+        while self.committed_events() < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.committed_events()
+
+
+class BatchingTest(WriterTestCase):
+    
+    def test_partial_batch_waits_for_flush(self):
+        for i in range(3):
+            self.dm.log_event('info', f'event {i}')
+        time.sleep(0.2)
+        self.assertEqual(self.committed_events(), 0)
+        
+        self.assertTrue(self.dm.flush())
+        self.assertEqual(self.committed_events(), 3)
+    
+    def test_full_batch_commits_on_its_own(self):
+        for i in range(5):
+            self.dm.log_event('info', f'event {i}')
+        self.assertEqual(self.wait_for_events(5), 5)
+
+
+class ShutdownTest(WriterTestCase):
+    
+    def test_close_drains_queue(self):
+        for i in range(3):
+            self.dm.log_event('info', f'event {i}')
+        self.dm.close()
+        self.assertEqual(self.committed_events(), 3)
+    
+    def test_calls_after_close_do_not_block(self):
+        self.dm.close()
+        self.assertTrue(self.dm.flush())
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.dm.log_event('info', 'too late')
+        self.assertIn('Database closed', output.getvalue())
+    
+    def test_dead_writer_writes_synchronously(self):
+        self.dm._queue.put((_STOP, threading.Event()))
+        self.dm._writer.join(2.0)
+        self.assertFalse(self.dm._writer.is_alive())
+        
+        self.dm.log_event('info', 'direct')
+        self.assertEqual(self.committed_events(), 1)
+    
+    def test_flush_timeout(self):
+        # A writer stuck behind the write lock makes flush give up, not hang
+        with self.dm.lock:
+            self.dm.log_event('info', 'stuck')
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(self.dm.flush(0.1))
+        self.assertTrue(self.dm.flush())
+
+
+if __name__ == '__main__':
+    unittest.main()
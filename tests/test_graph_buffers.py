@@ -0,0 +1,71 @@
+"""
+Graph data tests - the in-memory sample buffers behind the charts.
+"""
+import os
+import unittest
+
+import numpy as np
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from netscope.ui.main_window import _SampleBuffer, _decimate
+
+
+class SampleBufferTest(unittest.TestCase):
+    
+    def test_since_returns_window(self):
+        buffer = _SampleBuffer('cpu', capacity=10)
+        for t in range(5):
+            buffer.append(float(t), cpu=t * 10.0)
+        
+        times, values = buffer.since(2.0)
+        np.testing.assert_array_equal(times, [2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(values['cpu'], [20.0, 30.0, 40.0])
+        self.assertEqual(len(buffer.since(10.0)[0]), 0)
+    
+    def test_full_buffer_drops_older_half(self):
+        buffer = _SampleBuffer('upload', 'download', capacity=8)
+        for t in range(8):
+            buffer.append(float(t), upload=t, download=-t)
+        buffer.append(8.0, upload=8, download=-8)
+        
+        self.assertEqual(buffer.size, 5)
+        times, values = buffer.since(0.0)
+        np.testing.assert_array_equal(times, [4.0, 5.0, 6.0, 7.0, 8.0])
+        np.testing.assert_array_equal(values['upload'], [4, 5, 6, 7, 8])
+        np.testing.assert_array_equal(values['download'], [-4, -5, -6, -7, -8])
+
+
+
+class DecimateTest(unittest.TestCase):
+    
+    def test_short_series_unchanged(self):
+        times = np.arange(10, dtype=np.float64)
+        values = np.arange(10, dtype=np.float32)
+        out_times, (out_values,) = _decimate(times, (values,), width=5)
+        self.assertIs(out_times, times)
+        self.assertIs(out_values, values)
+    
+    def test_envelope_keeps_spikes(self):
+        times = np.arange(103, dtype=np.float64)
+        values = np.zeros(103, dtype=np.float32)
+        values[50] = 100.0
+        values[80] = -5.0
+        
+        out_times, (out_values,) = _decimate(times, (values,), width=10)
+        
+        # Two points per bucket; the 3 oldest samples don't fill a bucket
+        self.assertEqual(len(out_times), 20)
+        self.assertEqual(out_times[0], 3.0)
+        self.assertEqual(out_times[-1], 102.0)
+        self.assertEqual(out_values.max(), 100.0)
+        self.assertEqual(out_values.min(), -5.0)
+        self.assertTrue(np.all(np.diff(out_times) >= 0))
+    
+    def test_non_positive_width(self):
+        times = np.arange(10, dtype=np.float64)
+        self.assertIs(_decimate(times, (), width=0)[0], times)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Network monitor tests - probe lifetimes and counter parsing without touching the network.
+"""
+import math
+import socket
+import os
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from netscope.core import network_monitor
+from netscope.core.network_monitor import (
+    NetworkMonitor, _ICMP_ECHO_REPLY, _icmp_checksum, _parse_icmp_reply, _unwrap_counters
+)
+
+
+class _SilentSocket:
+    """Stands in for the ICMP socket: selectable, but no reply ever arrives."""
+    
+    def __init__(self):
+        self._r, self._w = socket.socketpair()
+        self.closed = False
+    
+    def fileno(self):
+        return self._r.fileno()
+    
+    def sendto(self, data, address):
+        return len(data)
+    
+    def recv(self, size):
+        raise BlockingIOError
+    
+    def close(self):
+        self.closed = True
+        self._r.close()
+        self._w.close()
+
+
+class MonitorTestCase(unittest.TestCase):
+    
+    def setUp(self):
+        # No public IP lookup from the constructor
+        patcher = mock.patch.object(NetworkMonitor, '_fetch_public_info')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = NetworkMonitor()
+        self.addCleanup(self.monitor.stop)
+
+
+class StopDuringProbeTest(MonitorTestCase):
+    
+    def test_in_flight_probe_closes_socket(self):
+        sock = _SilentSocket()
+        self.monitor._icmp_sock = sock
+        results = []
+        probe = threading.Thread(
+            target=lambda: results.append(self.monitor._icmp_ping('127.0.0.1', timeout=0.5))
+        )
+        probe.start()
+        time.sleep(0.1)
+        
+        self.monitor.stop()
+        self.assertFalse(sock.closed)
+        
+        probe.join()
+        self.assertEqual(results, [None])
+        self.assertTrue(sock.closed)
+        self.assertIsNone(self.monitor._icmp_sock)
+    
+    def test_no_socket_opened_after_stop(self):
+        self.monitor.stop()
+        with mock.patch('socket.socket') as opened:
+            self.assertIsNone(self.monitor._icmp_ping('127.0.0.1'))
+        opened.assert_not_called()
+    
+    def test_stop_detaches_singleton(self):
+        shared = NetworkMonitor.instance()
+        shared.stop()
+        fresh = NetworkMonitor.instance()
+        self.addCleanup(fresh.stop)
+        self.assertIsNot(fresh, shared)
+        self.assertIsNone(shared._submit(lambda: None))
+        self.assertIsNotNone(fresh._submit(lambda: None))
+
+
+
+class IcmpReplyTest(unittest.TestCase):
+    
+    def test_bare_icmp_message(self):
+        # Linux datagram sockets deliver the ICMP message alone
+        reply = struct.pack('!BBHHH', _ICMP_ECHO_REPLY, 0, 0, 0x1234, 42) + b'netscope'
+        self.assertEqual(_parse_icmp_reply(reply), (_ICMP_ECHO_REPLY, 42))
+    
+    def test_with_ipv4_header(self):
+        # macOS keeps the IPv4 header; IHL 6 means a 24-byte header with options
+        ip_header = bytes([0x46]) + bytes(23)
+        reply = ip_header + struct.pack('!BBHHH', _ICMP_ECHO_REPLY, 0, 0, 0x1234, 7)
+        self.assertEqual(_parse_icmp_reply(reply), (_ICMP_ECHO_REPLY, 7))
+    
+    def test_checksum(self):
+        message = struct.pack('!BBHHH', 8, 0, 0, 1, 1) + b'netscope'
+        checksum = _icmp_checksum(message)
+        filled = struct.pack('!BBHHH', 8, 0, checksum, 1, 1) + b'netscope'
+        self.assertEqual(_icmp_checksum(filled), 0)
+
+
+class PingLossTest(MonitorTestCase):
+    
+    def test_lost_reply_is_nan_without_fallback(self):
+        with mock.patch.object(self.monitor, '_icmp_ping', return_value=None) as icmp, \
+                mock.patch.object(self.monitor, '_dns_ping') as dns, \
+                mock.patch.object(self.monitor, '_subprocess_ping') as subprocess_ping:
+            self.assertTrue(math.isnan(self.monitor.get_ping_latency(count=2)))
+        self.assertEqual(icmp.call_count, 2)
+        dns.assert_not_called()
+        subprocess_ping.assert_not_called()
+    
+    def test_refused_icmp_falls_back(self):
+        def refused(host):
+            self.monitor._icmp_available = False
+        
+        with mock.patch.object(self.monitor, '_icmp_ping', side_effect=refused), \
+                mock.patch.object(self.monitor, '_dns_ping', return_value=12.5):
+            self.assertEqual(self.monitor.get_ping_latency(), 12.5)
+
+
+
+_PROC_NET_DEV_SAMPLE = b"""\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1000      10    0    0    0     0          0         0     1000      10    0    0    0     0       0          0
+  eth0: 5000000    4000    0    0    0     0          0         0  250000    2000    0    0    0     0       0          0
+"""
+
+
+class CounterTest(unittest.TestCase):
+    
+    def setUp(self):
+        # Each test starts without unwrap history
+        patcher = mock.patch.multiple(network_monitor, _raw_counters={}, _counter_offsets={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_unwrap_carries_wraps_and_resets(self):
+        self.assertEqual(_unwrap_counters({'eth0': (100, 200)}), {'eth0': (100, 200)})
+        self.assertEqual(_unwrap_counters({'eth0': (150, 300)}), {'eth0': (150, 300)})
+        # Send counter wrapped; receive counter kept counting
+        self.assertEqual(_unwrap_counters({'eth0': (20, 350)}), {'eth0': (170, 350)})
+        # Interface reset: both start over
+        self.assertEqual(_unwrap_counters({'eth0': (5, 10)}), {'eth0': (175, 360)})
+    
+    def test_proc_net_dev_parse(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(_PROC_NET_DEV_SAMPLE)
+        self.addCleanup(os.remove, f.name)
+        
+        with mock.patch.multiple(network_monitor, _PROC_NET_DEV=f.name, _HAVE_PROC_NET_DEV=True):
+            counters = network_monitor._read_interface_counters()
+        self.assertEqual(counters, {'lo': (1000, 1000), 'eth0': (250000, 5000000)})
+
+
+class RateTest(MonitorTestCase):
+    
+    def test_no_negative_rate_or_adapter_switch_spike(self):
+        readings = iter([
+            (1.0, {'eth0': (1000, 2000), 'wlan0': (10 ** 9, 10 ** 9)}),
+            (2.0, {'eth0': (1000 + 131072, 2000), 'wlan0': (10 ** 9, 10 ** 9)}),
+            (3.0, {'eth0': (500, 1000), 'wlan0': (10 ** 9, 10 ** 9)}),
+            (4.0, {'eth0': (500, 1000), 'wlan0': (10 ** 9, 10 ** 9)}),
+        ])
+        self.monitor.current_adapter = 'eth0'
+        with mock.patch.object(self.monitor, '_get_counters', side_effect=lambda: next(readings)), \
+                mock.patch.object(self.monitor, '_refresh_ping'):
+            first = self.monitor.get_network_stats()
+            second = self.monitor.get_network_stats()
+            backwards = self.monitor.get_network_stats()
+            self.monitor.current_adapter = 'wlan0'
+            switched = self.monitor.get_network_stats()
+        
+        self.assertEqual(first['upload_speed'], 0.0)
+        self.assertAlmostEqual(second['upload_speed'], 1.0)  # 128 KiB/s = 1 Mbit/s
+        self.assertEqual((backwards['upload_speed'], backwards['download_speed']), (0.0, 0.0))
+        self.assertEqual((switched['upload_speed'], switched['download_speed']), (0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()